@@ -0,0 +1,144 @@
+"""
+Admission control for the backend API.
+Limits concurrent database work with a short bounded queue, and optionally
+rate limits each client with a token bucket, so bursts are rejected quickly
+instead of piling up behind the connection pool.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted because the service is at capacity."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """Counting limiter on in-flight work with a bounded wait queue."""
+
+    def __init__(self, limit: int, max_queue: int, retry_after: float = 1.0):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Maximum number of concurrent holders
+            max_queue: Maximum number of callers allowed to wait for a slot
+            retry_after: Seconds clients are told to wait after a rejection
+        """
+        self.limit = limit
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: float) -> bool:
+        """
+        Take a slot, waiting in the queue for at most `timeout` seconds.
+
+        Args:
+            timeout: Longest time to wait for a slot
+
+        Returns:
+            True if a slot was taken, False if the wait timed out
+
+        Raises:
+            Overloaded: If the wait queue is already full
+        """
+        with self._condition:
+            if self.in_flight < self.limit:
+                self.in_flight += 1
+                return True
+
+            if self.waiting >= self.max_queue or timeout <= 0:
+                self.rejected += 1
+                raise Overloaded("Too many requests waiting for the database", self.retry_after)
+
+            self.waiting += 1
+            try:
+                admitted = self._condition.wait_for(lambda: self.in_flight < self.limit, timeout)
+            finally:
+                self.waiting -= 1
+
+            if not admitted:
+                self.rejected += 1
+                return False
+
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        """Give a slot back and wake one waiter."""
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def snapshot(self) -> Dict[str, int]:
+        """Get current limiter counters."""
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "max_queue": self.max_queue,
+                "rejected": self.rejected,
+            }
+
+
+class TokenBucketLimiter:
+    """Per-client token bucket rate limiter with a bounded number of tracked clients."""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Tokens added per second for each client
+            burst: Bucket capacity
+            max_clients: Number of client buckets kept; least recently seen clients are dropped
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, client: str, now: Optional[float] = None) -> Tuple[bool, float]:
+        """
+        Take a token for a client.
+
+        Args:
+            client: Client identifier
+            now: Current monotonic time (for testing)
+
+        Returns:
+            Tuple of (allowed, seconds until a token is available)
+        """
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            tokens, updated = self._buckets.pop(client, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+
+            self._buckets[client] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+
+        return allowed, 0.0 if allowed else (1 - tokens) / self.rate
+
+
+def retry_after_header(seconds: float) -> str:
+    """Format a delay as a Retry-After header value (whole seconds, at least 1)."""
+    return str(max(math.ceil(seconds), 1))
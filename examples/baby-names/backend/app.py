@@ -3,13 +3,78 @@ Backend REST API for baby names lookup.
 Provides endpoints to query baby name rankings from the database.
 """
 
-from flask import Flask, jsonify, request
+import os
+from typing import Optional
+
+import msgpack
+import observability
+import profiling
+from admission import Overloaded, TokenBucketLimiter, retry_after_header
+from deadlines import DEADLINE_HEADER, DeadlineExceeded, parse_budget, set_deadline
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
+from observability import timed_phase
 
 from database import db
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for frontend access
+CORS(app, expose_headers=[observability.REQUEST_ID_HEADER])  # Enable CORS for frontend access
+observability.init_app(app)
+profiling.init_app(app)
+
+# Internal binary transport used by the frontend when BACKEND_TRANSPORT=msgpack
+MSGPACK_MIMETYPE = "application/msgpack"
+INTERNAL_PREFIX = "/internal/"
+MAX_BATCH_SIZE = 500
+
+# Warm the connection pool and caches in the background before reporting ready
+WARM_UP_ENABLED = os.getenv("DB_WARM_UP", "false").lower() == "true"
+if WARM_UP_ENABLED:
+    db.start_warm_up()
+
+# Optional per-client rate limit on public and internal API routes (disabled when RATE_LIMIT_PER_SECOND is 0)
+RATE_LIMITED_PREFIXES = ("/api/", INTERNAL_PREFIX)
+RATE_LIMIT_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", "0"))
+rate_limiter = (
+    TokenBucketLimiter(RATE_LIMIT_PER_SECOND, int(os.getenv("RATE_LIMIT_BURST", "20"))) if RATE_LIMIT_PER_SECOND > 0 else None
+)
+# X-Forwarded-For entries appended by the proxies in front of the backend (2 behind a GCE load balancer,
+# which appends the client and its own address); 0 ignores the header and keys on the peer address
+TRUSTED_PROXIES = int(os.getenv("TRUSTED_PROXIES", "0"))
+
+
+def client_id() -> str:
+    """
+    Identify the end client from the X-Forwarded-For hop added by the outermost trusted proxy.
+
+    Earlier hops are supplied by the client and can be forged, so they are ignored. Without enough
+    hops the request did not come through the trusted proxies and the peer address is used.
+    """
+    hops = [hop.strip() for hop in request.headers.get("X-Forwarded-For", "").split(",") if hop.strip()]
+    if 0 < TRUSTED_PROXIES <= len(hops):
+        return hops[-TRUSTED_PROXIES]
+    return request.remote_addr or "unknown"
+
+
+@app.before_request
+def apply_deadline():
+    """Adopt the caller's remaining time budget and reject requests that have already run out."""
+    budget_ms = parse_budget(request.headers.get(DEADLINE_HEADER))
+    set_deadline(budget_ms)
+
+    if budget_ms is not None and budget_ms <= 0:
+        return error_response("Request deadline exceeded", 504)
+
+
+@app.before_request
+def apply_rate_limit():
+    """Reject API requests from clients that have exhausted their token bucket."""
+    if rate_limiter is None or not request.path.startswith(RATE_LIMITED_PREFIXES):
+        return None
+
+    allowed, retry_after = rate_limiter.allow(client_id())
+    if not allowed:
+        return error_response("Rate limit exceeded", 429, {"Retry-After": retry_after_header(retry_after)})
 
 
 @app.route("/health", methods=["GET"])
@@ -22,6 +87,20 @@ def health():
     ), 200 if db_healthy else 503
 
 
+@app.route("/ready", methods=["GET"])
+def ready():
+    """Readiness endpoint; reports ready while the database answers, and not before warm-up has finished."""
+    is_ready = (db.ready.is_set() or not WARM_UP_ENABLED) and db.health_check()
+
+    return jsonify({"status": "ready" if is_ready else "not ready"}), 200 if is_ready else 503
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Lookup hit ratios per cache tier and admission control counters."""
+    return jsonify({"cache": db.cache_stats(), "admission": db.limiter.snapshot()}), 200
+
+
 @app.route("/api/v1/names/<name>", methods=["GET"])
 def get_name(name):
     """
@@ -39,11 +118,42 @@ def get_name(name):
     result = db.get_name_rank(name)
 
     if result:
-        return jsonify({"name": result["name"], "rank": result["rank"], "count": result["count"], "year": result["year"]}), 200
+        response = name_payload(result)
+
+        with timed_phase("serialize"):
+            body = jsonify(response)
+        return body, 200
     else:
         return jsonify({"error": f'Name "{name}" not found in database', "name": name}), 404
 
 
+def name_payload(result):
+    """
+    Build the response body for a name record, including its share and percentile.
+
+    Args:
+        result: Name record from the database
+
+    Returns:
+        Dictionary with name, rank, count, year and distribution figures
+    """
+    payload = {"name": result["name"], "rank": result["rank"], "count": result["count"], "year": result["year"]}
+
+    try:
+        distribution = db.get_rank_distribution()
+    except (DeadlineExceeded, Overloaded) as error:
+        # The figures are optional; a name that was found is still returned without them
+        observability.logger.warning("Rank distribution unavailable", extra={"error": str(error)})
+        distribution = None
+
+    if distribution:
+        payload.update(distribution.describe_name(result["rank"], result["count"]))
+    else:
+        payload.update({"share": None, "percentile": None, "cumulative_share": None})
+
+    return payload
+
+
 @app.route("/api/v1/names", methods=["GET"])
 def get_all_names():
     """
@@ -63,19 +173,140 @@ def get_all_names():
 
     results = db.get_all_names(limit=limit)
 
-    return jsonify({"count": len(results), "names": results}), 200
+    with timed_phase("serialize"):
+        body = jsonify({"count": len(results), "names": results})
+    return body, 200
+
+
+@app.route("/api/v1/stats", methods=["GET"])
+def get_stats():
+    """
+    Get rank distribution statistics.
+
+    Query params:
+        top: Number of top ranks to report birth share for (default 10)
+
+    Returns:
+        JSON object with totals, coverage thresholds and top-N share
+    """
+    try:
+        top = max(int(request.args.get("top", 10)), 0)
+    except ValueError:
+        top = 10
+
+    distribution = db.get_rank_distribution()
+
+    if not distribution:
+        return jsonify({"error": "Statistics are not available"}), 503
+
+    return jsonify(distribution.summary(top=top)), 200
+
+
+def msgpack_response(payload, status):
+    """
+    Build a MessagePack response for the internal transport.
+
+    Args:
+        payload: Object to encode
+        status: HTTP status code
+
+    Returns:
+        Flask Response with a MessagePack body
+    """
+    with timed_phase("serialize"):
+        body = msgpack.packb(payload)
+    return Response(body, status=status, mimetype=MSGPACK_MIMETYPE)
+
+
+def error_response(message: str, status: int, headers: Optional[dict] = None):
+    """
+    Build an error response in the format of the route that failed.
+
+    Args:
+        message: Error message
+        status: HTTP status code
+        headers: Extra response headers
+
+    Returns:
+        MessagePack response on the internal transport, JSON response otherwise
+    """
+    if request.path.startswith(INTERNAL_PREFIX):
+        return msgpack_response({"error": message}, status), headers or {}
+    return jsonify({"error": message}), status, headers or {}
+
+
+@app.route("/internal/v1/names/<name>", methods=["GET"])
+def rpc_get_name(name):
+    """
+    Get rank information for a name over the internal MessagePack transport.
+
+    Args:
+        name: Baby name to look up
+
+    Returns:
+        MessagePack response with the same fields as GET /api/v1/names/<name>
+    """
+    if not name or len(name.strip()) == 0:
+        return msgpack_response({"error": "Name parameter is required"}, 400)
+
+    result = db.get_name_rank(name)
+
+    if result:
+        return msgpack_response(name_payload(result), 200)
+    return msgpack_response({"error": f'Name "{name}" not found in database', "name": name}, 404)
+
+
+@app.route("/internal/v1/names/lookup", methods=["POST"])
+def rpc_lookup_names():
+    """
+    Look up several names in one round trip over the internal MessagePack transport.
+
+    Request body:
+        MessagePack map {"names": [name, ...]} with at most MAX_BATCH_SIZE names
+
+    Returns:
+        MessagePack map {"results": [record or None, ...]} in request order
+    """
+    try:
+        names = msgpack.unpackb(request.get_data(), raw=False)["names"]
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            raise ValueError("names must be a list of strings")
+    except (ValueError, KeyError, TypeError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError):
+        return msgpack_response({"error": 'Body must be a MessagePack map with a "names" list'}, 400)
+
+    if len(names) > MAX_BATCH_SIZE:
+        return msgpack_response({"error": f"At most {MAX_BATCH_SIZE} names per request"}, 400)
+
+    found = db.get_name_ranks(names)
+    results = [name_payload(found[name.lower()]) if name.lower() in found else None for name in names]
+
+    return msgpack_response({"results": results}, 200)
 
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
-    return jsonify({"error": "Endpoint not found"}), 404
+    return error_response("Endpoint not found", 404)
+
+
+@app.errorhandler(DeadlineExceeded)
+def deadline_exceeded(error):
+    """Handle requests that ran out of time waiting on the database."""
+    observability.logger.warning("Deadline exceeded", extra={"error": str(error)})
+    return error_response("Request deadline exceeded", 504)
+
+
+@app.errorhandler(Overloaded)
+def overloaded(error):
+    """Shed load quickly when the database admission queue is full."""
+    observability.logger.warning("Request shed", extra={"error": str(error), "admission": db.limiter.snapshot()})
+    return error_response("Service overloaded, please retry", 503, {"Retry-After": retry_after_header(error.retry_after)})
 
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
-    return jsonify({"error": "Internal server error"}), 500
+    return error_response("Internal server error", 500)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,160 @@
+"""
+Shared cache tier for name lookups.
+Caches name records in a Redis-compatible server shared by all backend replicas,
+so each name is read from PostgreSQL once per dataset version rather than once
+per replica. Keys include the dataset version, so reloading the data invalidates
+every entry without a flush. When the cache is unreachable it is bypassed for a
+short while and lookups go straight to the database.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+import msgpack
+import redis
+from observability import logger, timed_phase
+
+# Redis URL of the shared cache, e.g. redis://redis:6379/0 (unset disables the shared tier)
+CACHE_URL = os.getenv("CACHE_URL", "")
+# Lifetime of cached records; versioned keys make this a memory bound rather than a staleness bound
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "86400"))
+# Connect and read timeout for cache calls, kept well under a database lookup
+CACHE_TIMEOUT_MS = float(os.getenv("CACHE_TIMEOUT_MS", "50"))
+# How long the cache is bypassed after a failed call before it is tried again
+CACHE_RETRY_SECONDS = float(os.getenv("CACHE_RETRY_SECONDS", "5"))
+
+KEY_PREFIX = "baby-names"
+
+
+class TierStats:
+    """Lookup and hit counters for one cache tier."""
+
+    def __init__(self):
+        self.lookups = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def record(self, lookups: int, hits: int):
+        """
+        Count lookups against the tier.
+
+        Args:
+            lookups: Number of keys looked up
+            hits: Number of keys found
+        """
+        with self._lock:
+            self.lookups += lookups
+            self.hits += hits
+
+    def snapshot(self) -> Dict[str, float]:
+        """Get the counters and hit ratio."""
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_ratio": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            }
+
+
+class SharedCache:
+    """Versioned name record cache on a Redis-compatible server, bypassed while unreachable."""
+
+    def __init__(self, client, ttl: int = CACHE_TTL_SECONDS, retry_seconds: float = CACHE_RETRY_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            client: redis.Redis (or compatible) client
+            ttl: Lifetime of cached records in seconds
+            retry_seconds: How long to bypass the cache after a failed call
+        """
+        self.client = client
+        self.ttl = ttl
+        self.retry_seconds = retry_seconds
+        self.stats = TierStats()
+        self.errors = 0
+        self.bypassed = 0
+        self._unavailable_until = 0.0
+
+    @classmethod
+    def from_url(cls, url: str, timeout_ms: float = CACHE_TIMEOUT_MS) -> "SharedCache":
+        """
+        Create a cache backed by the server at a Redis URL.
+
+        Args:
+            url: Redis URL
+            timeout_ms: Connect and read timeout in milliseconds
+        """
+        timeout = timeout_ms / 1000
+        client = redis.Redis.from_url(url, socket_connect_timeout=timeout, socket_timeout=timeout, retry_on_timeout=False)
+        return cls(client)
+
+    @staticmethod
+    def key(version: str, name: str) -> str:
+        """Build the cache key for a lower-cased name in a dataset version."""
+        return f"{KEY_PREFIX}:{version}:name:{name}"
+
+    def available(self) -> bool:
+        """Whether the cache should be tried, i.e. it has not failed within the last retry_seconds."""
+        return time.monotonic() >= self._unavailable_until
+
+    def _failed(self, operation: str, error: Exception):
+        self.errors += 1
+        self._unavailable_until = time.monotonic() + self.retry_seconds
+        logger.warning("Shared cache unavailable, bypassing", extra={"operation": operation, "error": str(error)})
+
+    def get_many(self, version: str, names: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch cached records for several names in one round trip.
+
+        Args:
+            version: Dataset version
+            names: Lower-cased names
+
+        Returns:
+            Dictionary mapping each cached name to its record, or None for a cached "not found";
+            names that are not cached are absent
+        """
+        names = list(names)
+        if not names:
+            return {}
+        if not self.available():
+            self.bypassed += len(names)
+            return {}
+
+        try:
+            with timed_phase("cache"):
+                values = self.client.mget([self.key(version, name) for name in names])
+        except redis.RedisError as error:
+            self._failed("get", error)
+            return {}
+
+        found = {name: msgpack.unpackb(value) for name, value in zip(names, values, strict=True) if value is not None}
+        self.stats.record(len(names), len(found))
+        return found
+
+    def set_many(self, version: str, records: Dict[str, Optional[Dict]]):
+        """
+        Store records for several names in one pipelined round trip.
+
+        Args:
+            version: Dataset version
+            records: Dictionary mapping lower-cased names to records, or None for names not found
+        """
+        if not records or not self.available():
+            return
+
+        try:
+            with timed_phase("cache"):
+                pipeline = self.client.pipeline(transaction=False)
+                for name, record in records.items():
+                    pipeline.set(self.key(version, name), msgpack.packb(record), ex=self.ttl)
+                pipeline.execute()
+        except redis.RedisError as error:
+            self._failed("set", error)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Get hit ratio and error counters."""
+        return {**self.stats.snapshot(), "errors": self.errors, "bypassed": self.bypassed, "available": self.available()}
@@ -3,20 +3,93 @@ Database connection and query module for baby names API.
 """
 
 import os
+import threading
+import time
 from typing import Dict, List, Optional
 
 import psycopg2
+from admission import ConcurrencyLimiter, Overloaded
+from cache import CACHE_URL, SharedCache, TierStats
+from deadlines import DeadlineExceeded, bounded_timeout, remaining_seconds
+from observability import logger, timed_phase
 from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
+from stats import RankDistribution
+
+# Upper bound on any single statement, applied to every pooled connection
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+# Longest a request will wait in the admission queue for a free pooled connection
+POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "0.5"))
+# Connections kept open by the pool (and pre-opened by warm-up)
+MIN_CONNECTIONS = int(os.getenv("DB_MIN_CONNECTIONS", "1"))
+MAX_CONNECTIONS = 10
+# Concurrent requests admitted to the pool; the remaining connection is reserved for health checks
+CONCURRENCY_LIMIT = min(int(os.getenv("DB_CONCURRENCY_LIMIT", str(MAX_CONNECTIONS - 1))), MAX_CONNECTIONS - 1)
+# Requests allowed to wait for a slot before new arrivals are rejected outright
+QUEUE_SIZE = int(os.getenv("DB_QUEUE_SIZE", "20"))
+RETRY_AFTER_SECONDS = float(os.getenv("DB_RETRY_AFTER_SECONDS", "1"))
+# How often the dataset version behind the shared cache keys and the rank distribution is rechecked
+DATASET_VERSION_TTL_SECONDS = float(os.getenv("DATASET_VERSION_TTL_SECONDS", "10"))
+
+# Every statement issued by Database; each one is covered by tests/performance/test_query_plans.py
+NAME_RANK_QUERY = """
+    SELECT name, rank, count, year
+    FROM baby_names
+    WHERE LOWER(name) = LOWER(%s)
+    LIMIT 1
+"""
+
+NAME_RANKS_QUERY = """
+    SELECT name, rank, count, year
+    FROM baby_names
+    WHERE LOWER(name) = ANY(%s)
+"""
+
+ALL_NAMES_QUERY = """
+    SELECT name, rank, count, year
+    FROM baby_names
+    ORDER BY rank
+    LIMIT %s
+"""
+
+RANK_COUNTS_QUERY = "SELECT rank, count FROM baby_names ORDER BY rank"
+
+HEALTH_CHECK_QUERY = "SELECT 1"
+
+# reload_data.py swaps in a new table, so the table's OID identifies the loaded dataset
+DATASET_VERSION_QUERY = "SELECT 'baby_names'::regclass::oid"
 
 
 class Database:
     """Database connection manager with connection pooling."""
 
     def __init__(self):
-        """Initialize database connection pool."""
-        self.connection_pool = None
-        self._initialize_pool()
+        """Initialize database state; the connection pool is created on first use."""
+        self._connection_pool = None
+        self._pool_lock = threading.Lock()
+        self.ready = threading.Event()
+        self.limiter = ConcurrencyLimiter(CONCURRENCY_LIMIT, QUEUE_SIZE, RETRY_AFTER_SECONDS)
+        self.stats_retry_seconds = float(os.getenv("STATS_RETRY_SECONDS", "5"))
+        self._distribution = None
+        self._distribution_retry_at = 0.0
+        self._distribution_generation = 0
+        self._distribution_lock = threading.Lock()
+        self._distribution_refreshing = False
+        self.cache = SharedCache.from_url(CACHE_URL) if CACHE_URL else None
+        self.database_stats = TierStats()
+        self._dataset_version = None
+        self._dataset_version_checked_at = 0.0
+        self._dataset_version_lock = threading.Lock()
+        self._dataset_version_refreshing = False
+
+    @property
+    def connection_pool(self):
+        """Connection pool, created on first access."""
+        if self._connection_pool is None:
+            with self._pool_lock:
+                if self._connection_pool is None:
+                    self._initialize_pool()
+        return self._connection_pool
 
     def _initialize_pool(self):
         """Create PostgreSQL connection pool."""
@@ -26,66 +99,184 @@ class Database:
 
             # Base connection parameters
             conn_params = {
-                "minconn": 1,
-                "maxconn": 10,
+                "minconn": MIN_CONNECTIONS,
+                "maxconn": MAX_CONNECTIONS,
                 "host": os.getenv("DB_HOST", "localhost"),
                 "port": os.getenv("DB_PORT", "5432"),
                 "database": os.getenv("DB_NAME", "baby_names"),
                 "user": os.getenv("DB_USER", "app_user"),
+                "options": f"-c statement_timeout={STATEMENT_TIMEOUT_MS}",
             }
 
             # Add password only for non-IAM authentication
             if not use_iam_auth:
                 conn_params["password"] = os.getenv("DB_PASSWORD", "app_password")
 
-            self.connection_pool = pool.SimpleConnectionPool(**conn_params)
+            # Request threads and the warm-up thread share the pool, so it must be the thread-safe variant
+            self._connection_pool = pool.ThreadedConnectionPool(**conn_params)
         except (Exception, psycopg2.DatabaseError) as error:
-            print(f"Error creating connection pool: {error}")
+            logger.error("Error creating connection pool", extra={"error": str(error)})
             raise
 
     def get_connection(self):
-        """Get a connection from the pool."""
-        return self.connection_pool.getconn()
+        """
+        Get a connection from the pool once admitted by the concurrency limiter.
+
+        The wait for a slot is bounded by the request deadline and the admission queue timeout.
+
+        Raises:
+            DeadlineExceeded: If the request deadline ran out before a slot became free
+            Overloaded: If the admission queue is full, the queue wait timed out or the pool is exhausted
+        """
+        with timed_phase("pool_wait"):
+            timeout = bounded_timeout(POOL_TIMEOUT_SECONDS)
+            if timeout <= 0 < POOL_TIMEOUT_SECONDS:
+                raise DeadlineExceeded("Request deadline exceeded before acquiring a connection")
+
+            if not self.limiter.acquire(timeout):
+                if timeout < POOL_TIMEOUT_SECONDS:
+                    raise DeadlineExceeded("Request deadline exceeded waiting for a database connection")
+                raise Overloaded("Timed out waiting for a database connection", self.limiter.retry_after)
+
+            try:
+                return self.connection_pool.getconn()
+            except pool.PoolError as error:
+                # Only reachable if the pool is smaller than the limiter admits; shed rather than report "not found"
+                self.limiter.release()
+                raise Overloaded("Connection pool exhausted", self.limiter.retry_after) from error
+            except Exception:
+                self.limiter.release()
+                raise
 
     def return_connection(self, conn):
         """Return a connection to the pool."""
-        self.connection_pool.putconn(conn)
+        try:
+            self.connection_pool.putconn(conn)
+        finally:
+            self.limiter.release()
+
+    def _execute(self, cursor, query: str, params: Optional[tuple] = None):
+        """
+        Execute a statement with its timeout bounded by the request deadline.
+
+        Args:
+            cursor: Cursor to execute on
+            query: SQL statement
+            params: Statement parameters
+
+        Raises:
+            DeadlineExceeded: If the deadline has passed or Postgres cancelled the statement
+        """
+        remaining = remaining_seconds()
+        if remaining is not None:
+            timeout_ms = int(min(remaining * 1000, STATEMENT_TIMEOUT_MS))
+            if timeout_ms <= 0:
+                raise DeadlineExceeded("Request deadline exceeded before query")
+            # SET LOCAL only lasts until the pool rolls the transaction back on return
+            cursor.execute("SET LOCAL statement_timeout = %s", (timeout_ms,))
+
+        try:
+            cursor.execute(query, params)
+        except psycopg2.errors.QueryCanceled as error:
+            raise DeadlineExceeded("Query cancelled by statement timeout") from error
 
     def get_name_rank(self, name: str) -> Optional[Dict]:
         """
         Get rank information for a given baby name.
 
+        The shared cache, when configured, is checked first; only misses take a database connection.
+
         Args:
             name: The baby name to search for (case-insensitive)
 
         Returns:
             Dictionary with name, rank, and count, or None if not found
         """
+        key = name.lower()
+        version = self.dataset_version() if self.cache else None
+        if version:
+            cached = self.cache.get_many(version, [key])
+            if key in cached:
+                return cached[key]
+
         conn = None
         try:
             conn = self.get_connection()
             cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-            query = """
-                SELECT name, rank, count, year
-                FROM baby_names
-                WHERE LOWER(name) = LOWER(%s)
-                LIMIT 1
-            """
-
-            cursor.execute(query, (name,))
-            result = cursor.fetchone()
+            with timed_phase("query"):
+                self._execute(cursor, NAME_RANK_QUERY, (name,))
+                result = cursor.fetchone()
             cursor.close()
 
-            return dict(result) if result else None
+            record = dict(result) if result else None
 
+        except (DeadlineExceeded, Overloaded):
+            raise
         except (Exception, psycopg2.DatabaseError) as error:
-            print(f"Error querying database: {error}")
+            logger.error("Error querying database", extra={"error": str(error)})
             return None
         finally:
             if conn:
                 self.return_connection(conn)
 
+        self.database_stats.record(1, int(record is not None))
+        if version:
+            self.cache.set_many(version, {key: record})
+        return record
+
+    def get_name_ranks(self, names: List[str]) -> Dict[str, Dict]:
+        """
+        Get rank information for several names in one query.
+
+        With the shared cache configured, all names are fetched from it in one round trip and only
+        the misses are queried; if every name is cached no database connection is taken.
+
+        Args:
+            names: Baby names to search for (case-insensitive)
+
+        Returns:
+            Dictionary mapping each found name, lower-cased, to its record
+        """
+        if not names:
+            return {}
+
+        keys = list(dict.fromkeys(name.lower() for name in names))
+        cached = {}
+        version = self.dataset_version() if self.cache else None
+        if version:
+            cached = self.cache.get_many(version, keys)
+            keys = [key for key in keys if key not in cached]
+            if not keys:
+                return {key: record for key, record in cached.items() if record is not None}
+
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+            with timed_phase("query"):
+                self._execute(cursor, NAME_RANKS_QUERY, (keys,))
+                results = cursor.fetchall()
+            cursor.close()
+
+            found = {row["name"].lower(): dict(row) for row in results}
+
+        except (DeadlineExceeded, Overloaded):
+            raise
+        except (Exception, psycopg2.DatabaseError) as error:
+            logger.error("Error querying database", extra={"error": str(error)})
+            return {key: record for key, record in cached.items() if record is not None}
+        finally:
+            if conn:
+                self.return_connection(conn)
+
+        self.database_stats.record(len(keys), len(found))
+        if version:
+            self.cache.set_many(version, {key: found.get(key) for key in keys})
+        found.update((key, record) for key, record in cached.items() if record is not None)
+        return found
+
     def get_all_names(self, limit: int = 100) -> List[Dict]:
         """
         Get all baby names (for testing purposes).
@@ -101,26 +292,170 @@ class Database:
             conn = self.get_connection()
             cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-            query = """
-                SELECT name, rank, count, year
-                FROM baby_names
-                ORDER BY rank
-                LIMIT %s
-            """
-
-            cursor.execute(query, (limit,))
-            results = cursor.fetchall()
+            with timed_phase("query"):
+                self._execute(cursor, ALL_NAMES_QUERY, (limit,))
+                results = cursor.fetchall()
             cursor.close()
 
             return [dict(row) for row in results]
 
+        except (DeadlineExceeded, Overloaded):
+            raise
         except (Exception, psycopg2.DatabaseError) as error:
-            print(f"Error querying database: {error}")
+            logger.error("Error querying database", extra={"error": str(error)})
             return []
         finally:
             if conn:
                 self.return_connection(conn)
 
+    def get_rank_distribution(self) -> Optional[RankDistribution]:
+        """
+        Get the precomputed rank distribution of the loaded dataset.
+
+        The snapshot is kept until the dataset version changes (dataset_version() discards it), so its
+        totals always match the counts lookups return, whether or not the shared cache is enabled. Only
+        one caller loads it, outside the lock; the others get None meanwhile instead of waiting on the
+        scan. After a failed load it is not retried for stats_retry_seconds.
+
+        Returns:
+            RankDistribution snapshot, or None if no data could be loaded
+        """
+        self.dataset_version()
+
+        with self._distribution_lock:
+            previous = self._distribution
+            if previous is not None or self._distribution_refreshing or time.monotonic() < self._distribution_retry_at:
+                return previous
+            self._distribution_refreshing = True
+            generation = self._distribution_generation
+
+        distribution = None
+        try:
+            rows = self._fetch_rank_counts()
+            if rows:
+                distribution = RankDistribution(rows)
+        finally:
+            with self._distribution_lock:
+                self._distribution_refreshing = False
+                # A refresh_rank_distribution() during the load means the rows may be from the old dataset
+                if generation == self._distribution_generation:
+                    if distribution is not None:
+                        self._distribution = distribution
+                    else:
+                        self._distribution_retry_at = time.monotonic() + self.stats_retry_seconds
+
+        return distribution
+
+    def refresh_rank_distribution(self):
+        """Discard the cached rank distribution so the next request reloads it."""
+        with self._distribution_lock:
+            self._distribution = None
+            self._distribution_retry_at = 0.0
+            self._distribution_generation += 1
+
+    def _fetch_rank_counts(self) -> List[tuple]:
+        """
+        Fetch (rank, count) pairs for every name.
+
+        Returns:
+            List of (rank, count) tuples, or an empty list on error
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            with timed_phase("query"):
+                self._execute(cursor, RANK_COUNTS_QUERY)
+                results = cursor.fetchall()
+            cursor.close()
+
+            return [(row[0], row[1]) for row in results]
+
+        except (DeadlineExceeded, Overloaded):
+            raise
+        except (Exception, psycopg2.DatabaseError) as error:
+            logger.error("Error loading rank distribution", extra={"error": str(error)})
+            return []
+        finally:
+            if conn:
+                self.return_connection(conn)
+
+    def dataset_version(self) -> Optional[str]:
+        """
+        Get the version of the loaded dataset, rechecking it at most every DATASET_VERSION_TTL_SECONDS.
+
+        A new version (after reload_data.py) moves shared cache lookups to fresh keys and discards the
+        cached rank distribution. Only one caller rereads the version, outside the lock; the others keep
+        using the last known version meanwhile, so cache hits never queue for a database connection.
+        A failed read also counts as a check, so it is not retried before the TTL expires again.
+
+        Returns:
+            Version string, or None if it has never been read
+        """
+        with self._dataset_version_lock:
+            previous = self._dataset_version
+            if (
+                self._dataset_version_refreshing
+                or time.monotonic() - self._dataset_version_checked_at < DATASET_VERSION_TTL_SECONDS
+            ):
+                return previous
+            self._dataset_version_refreshing = True
+
+        version = None
+        try:
+            version = self._fetch_dataset_version()
+        finally:
+            with self._dataset_version_lock:
+                if version is not None:
+                    self._dataset_version = version
+                self._dataset_version_checked_at = time.monotonic()
+                self._dataset_version_refreshing = False
+
+        if version is None:
+            return previous
+
+        if previous is not None and version != previous:
+            logger.info("Dataset version changed", extra={"previous": previous, "version": version})
+            self.refresh_rank_distribution()
+
+        return version
+
+    def _fetch_dataset_version(self) -> Optional[str]:
+        """
+        Read the dataset version from the database.
+
+        Returns:
+            Version string, or None on error (including when the request is shed or out of time)
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            with timed_phase("query"):
+                self._execute(cursor, DATASET_VERSION_QUERY)
+                version = cursor.fetchone()[0]
+            cursor.close()
+            return str(version)
+        except (Exception, psycopg2.DatabaseError) as error:
+            logger.warning("Error reading dataset version", extra={"error": str(error)})
+            return None
+        finally:
+            if conn:
+                self.return_connection(conn)
+
+    def cache_stats(self) -> Dict[str, Dict]:
+        """
+        Get lookup and hit counters for each tier that serves name lookups.
+
+        Returns:
+            Dictionary with a "shared" entry (when the shared cache is configured) and a "database" entry
+        """
+        tiers = {}
+        if self.cache:
+            tiers["shared"] = self.cache.snapshot()
+        tiers["database"] = self.database_stats.snapshot()
+        return tiers
+
     def health_check(self) -> bool:
         """
         Check if database is accessible.
@@ -130,22 +465,70 @@ class Database:
         """
         conn = None
         try:
-            conn = self.get_connection()
+            # Bypass admission control so probes keep working while traffic is being shed
+            conn = self.connection_pool.getconn()
             cursor = conn.cursor()
-            cursor.execute("SELECT 1")
+            with timed_phase("query"):
+                cursor.execute(HEALTH_CHECK_QUERY)
             cursor.close()
             return True
         except (Exception, psycopg2.DatabaseError) as error:
-            print(f"Database health check failed: {error}")
+            logger.warning("Database health check failed", extra={"error": str(error)})
             return False
         finally:
             if conn:
+                self.connection_pool.putconn(conn)
+
+    def warm_up(self) -> bool:
+        """
+        Pre-open the pool's idle connections, run the lookup query on each and load the rank distribution.
+
+        Connections are held together so each one is opened, but never more than the limiter admits at
+        once; otherwise a DB_MIN_CONNECTIONS above DB_CONCURRENCY_LIMIT would fail every attempt.
+
+        Returns:
+            True if the database is warm and ready to serve traffic, False otherwise
+        """
+        conns = []
+        try:
+            for _ in range(min(MIN_CONNECTIONS, self.limiter.limit)):
+                conns.append(self.get_connection())
+            for conn in conns:
+                cursor = conn.cursor()
+                self._execute(cursor, NAME_RANK_QUERY, ("",))
+                cursor.close()
+        except (Exception, psycopg2.DatabaseError) as error:
+            logger.warning("Database warm-up failed", extra={"error": str(error)})
+            return False
+        finally:
+            for conn in conns:
                 self.return_connection(conn)
 
+        if self.get_rank_distribution() is None:
+            return False
+
+        self.ready.set()
+        logger.info("Database warm-up complete", extra={"connections": len(conns)})
+        return True
+
+    def start_warm_up(self, retry_seconds: float = 2.0):
+        """
+        Warm up in a background thread, retrying until Postgres is available.
+
+        Args:
+            retry_seconds: Delay between warm-up attempts
+        """
+
+        def run():
+            while not self.warm_up():
+                time.sleep(retry_seconds)
+
+        threading.Thread(target=run, name="db-warm-up", daemon=True).start()
+
     def close_all_connections(self):
         """Close all connections in the pool."""
-        if self.connection_pool:
-            self.connection_pool.closeall()
+        if self._connection_pool:
+            self._connection_pool.closeall()
 
 
 # Global database instance
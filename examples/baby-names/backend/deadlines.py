@@ -0,0 +1,74 @@
+"""
+Request deadline tracking for the backend API.
+The frontend sends its remaining time budget in a header; the backend uses it
+to bound pool waits and Postgres statement timeouts for that request.
+"""
+
+import contextvars
+import math
+import time
+from typing import Optional
+
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request runs out of time before its work is complete."""
+
+
+def set_deadline(budget_ms: Optional[float]):
+    """
+    Set the deadline for the current request.
+
+    Args:
+        budget_ms: Remaining time budget in milliseconds, or None for no deadline
+    """
+    _deadline.set(None if budget_ms is None else time.monotonic() + budget_ms / 1000)
+
+
+def parse_budget(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a deadline header value.
+
+    Args:
+        value: Header value in milliseconds
+
+    Returns:
+        Budget in milliseconds, or None if the header is missing, malformed or not finite
+    """
+    if value is None:
+        return None
+    try:
+        budget_ms = float(value)
+    except ValueError:
+        return None
+    return budget_ms if math.isfinite(budget_ms) else None
+
+
+def remaining_seconds() -> Optional[float]:
+    """
+    Get the time left before the current request's deadline.
+
+    Returns:
+        Remaining seconds (may be negative), or None if the request has no deadline
+    """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def bounded_timeout(default: float) -> float:
+    """
+    Cap a timeout so it does not outlive the current request's deadline.
+
+    Args:
+        default: Timeout in seconds to use when there is more time left than this
+
+    Returns:
+        Timeout in seconds, never negative
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return default
+    return max(min(default, remaining), 0.0)
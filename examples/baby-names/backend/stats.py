@@ -0,0 +1,117 @@
+"""
+Rank distribution statistics for baby names.
+Answers share, percentile and cumulative queries from precomputed prefix sums.
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Coverage thresholds reported by the stats endpoint (percent of all births)
+COVERAGE_THRESHOLDS = (50, 75, 90, 99)
+
+
+class RankDistribution:
+    """Immutable snapshot of the rank/count distribution with cumulative counts."""
+
+    def __init__(self, rows: Iterable[Tuple[int, int]]):
+        """
+        Build the distribution from (rank, count) pairs.
+
+        Args:
+            rows: Iterable of (rank, count) pairs, in any order
+        """
+        ordered = sorted(rows)
+        self.ranks: List[int] = [rank for rank, _ in ordered]
+        self.counts: List[int] = [count for _, count in ordered]
+        self.cumulative: List[int] = list(accumulate(self.counts))
+
+    @property
+    def total_names(self) -> int:
+        """Number of distinct names in the distribution."""
+        return len(self.ranks)
+
+    @property
+    def total_births(self) -> int:
+        """Total number of births across all names."""
+        return self.cumulative[-1] if self.cumulative else 0
+
+    def cumulative_count(self, rank: int) -> int:
+        """
+        Get the number of births given to names ranked at or above a rank.
+
+        Args:
+            rank: Rank threshold (inclusive)
+
+        Returns:
+            Cumulative birth count for all names with rank <= the threshold
+        """
+        position = bisect_right(self.ranks, rank)
+        return self.cumulative[position - 1] if position else 0
+
+    def top_share(self, top: int) -> float:
+        """
+        Get the percentage of all births covered by the top N ranks.
+
+        Args:
+            top: Number of top ranks to include
+
+        Returns:
+            Percentage of births (0-100)
+        """
+        if not self.total_births:
+            return 0.0
+        return round(100 * self.cumulative_count(top) / self.total_births, 2)
+
+    def names_for_share(self, share: float) -> int:
+        """
+        Get how many top names are needed to cover a share of all births.
+
+        Args:
+            share: Target percentage of births (0-100)
+
+        Returns:
+            Number of names, in rank order, whose births reach the target share
+        """
+        target = self.total_births * share / 100
+        return min(bisect_left(self.cumulative, target) + 1, self.total_names)
+
+    def describe_name(self, rank: int, count: int) -> Dict:
+        """
+        Get share and percentile figures for a single name.
+
+        Args:
+            rank: Rank of the name
+            count: Birth count of the name
+
+        Returns:
+            Dictionary with share, percentile and cumulative share
+        """
+        if not self.total_births:
+            return {"share": None, "percentile": None, "cumulative_share": None}
+
+        ranked_below = self.total_names - bisect_right(self.ranks, rank)
+        return {
+            "share": round(100 * count / self.total_births, 4),
+            "percentile": round(100 * ranked_below / self.total_names, 2),
+            "cumulative_share": round(100 * self.cumulative_count(rank) / self.total_births, 2),
+        }
+
+    def summary(self, top: Optional[int] = None) -> Dict:
+        """
+        Get a summary of the distribution.
+
+        Args:
+            top: Optional number of top ranks to report coverage for
+
+        Returns:
+            Dictionary with totals, coverage thresholds and optional top-N share
+        """
+        summary = {
+            "total_names": self.total_names,
+            "total_births": self.total_births,
+            "names_for_share": {str(share): self.names_for_share(share) for share in COVERAGE_THRESHOLDS},
+        }
+        if top is not None:
+            summary["top"] = {"n": top, "count": self.cumulative_count(top), "share": self.top_share(top)}
+        return summary
@@ -0,0 +1,89 @@
+"""
+Unit tests for admission control.
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from admission import ConcurrencyLimiter, Overloaded, TokenBucketLimiter, retry_after_header
+
+
+def test_limiter_admits_up_to_limit():
+    """Test slots are granted immediately up to the limit."""
+    limiter = ConcurrencyLimiter(limit=2, max_queue=1)
+
+    assert limiter.acquire(timeout=0.01)
+    assert limiter.acquire(timeout=0.01)
+    assert limiter.snapshot()["in_flight"] == 2
+
+
+def test_limiter_rejects_when_queue_full():
+    """Test callers are rejected immediately once the queue is full."""
+    limiter = ConcurrencyLimiter(limit=1, max_queue=0, retry_after=3)
+    limiter.acquire(timeout=0.01)
+
+    with pytest.raises(Overloaded) as excinfo:
+        limiter.acquire(timeout=1)
+
+    assert excinfo.value.retry_after == 3
+    assert limiter.snapshot()["rejected"] == 1
+
+
+def test_limiter_queue_timeout():
+    """Test a queued caller gives up after its timeout."""
+    limiter = ConcurrencyLimiter(limit=1, max_queue=1)
+    limiter.acquire(timeout=0.01)
+
+    assert limiter.acquire(timeout=0.01) is False
+    assert limiter.snapshot()["waiting"] == 0
+
+
+def test_limiter_release_wakes_waiter():
+    """Test releasing a slot admits a queued caller."""
+    limiter = ConcurrencyLimiter(limit=1, max_queue=1)
+    limiter.acquire(timeout=0.01)
+    results = []
+
+    waiter = threading.Thread(target=lambda: results.append(limiter.acquire(timeout=5)))
+    waiter.start()
+    limiter.release()
+    waiter.join()
+
+    assert results == [True]
+    assert limiter.snapshot()["in_flight"] == 1
+
+
+def test_token_bucket_refills():
+    """Test a client is limited after its burst and refilled over time."""
+    bucket = TokenBucketLimiter(rate=2, burst=2)
+
+    assert bucket.allow("client", now=0.0) == (True, 0.0)
+    assert bucket.allow("client", now=0.0) == (True, 0.0)
+
+    allowed, retry_after = bucket.allow("client", now=0.0)
+    assert not allowed
+    assert retry_after == pytest.approx(0.5)
+
+    assert bucket.allow("client", now=0.5)[0]
+
+
+def test_token_bucket_bounds_tracked_clients():
+    """Test least recently seen clients are evicted."""
+    bucket = TokenBucketLimiter(rate=1, burst=1, max_clients=2)
+
+    for client in ("a", "b", "c"):
+        bucket.allow(client, now=0.0)
+
+    assert bucket.allow("a", now=0.0)[0]
+
+
+def test_retry_after_header():
+    """Test Retry-After is rounded up to whole seconds."""
+    assert retry_after_header(0.2) == "1"
+    assert retry_after_header(2.5) == "3"
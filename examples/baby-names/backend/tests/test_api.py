@@ -6,12 +6,16 @@ import os
 import sys
 from unittest.mock import patch
 
+import msgpack
 import pytest
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app import app
+from admission import Overloaded, TokenBucketLimiter
+from app import app, client_id
+from deadlines import DeadlineExceeded
+from stats import RankDistribution
 
 
 @pytest.fixture
@@ -41,6 +45,54 @@ def test_health_endpoint_db_down(client):
         assert data["status"] == "unhealthy"
 
 
+def test_metrics_endpoint(client):
+    """Test metrics report per-tier lookup hit ratios and admission counters."""
+    tiers = {"database": {"lookups": 4, "hits": 3, "hit_ratio": 0.75}}
+    with patch("app.db.cache_stats", return_value=tiers):
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["cache"] == tiers
+    assert "in_flight" in data["admission"]
+
+
+def test_ready_endpoint_after_warm_up(client):
+    """Test readiness follows warm-up when it is enabled."""
+    with (
+        patch("app.WARM_UP_ENABLED", True),
+        patch("app.db.ready") as mock_ready,
+        patch("app.db.health_check", return_value=True) as mock_health_check,
+    ):
+        mock_ready.is_set.return_value = False
+        assert client.get("/ready").status_code == 503
+        mock_health_check.assert_not_called()
+
+        mock_ready.is_set.return_value = True
+        assert client.get("/ready").status_code == 200
+
+
+def test_ready_endpoint_database_lost_after_warm_up(client):
+    """Test a warmed-up pod stops reporting ready when the database becomes unreachable."""
+    with (
+        patch("app.WARM_UP_ENABLED", True),
+        patch("app.db.ready") as mock_ready,
+        patch("app.db.health_check", return_value=False),
+    ):
+        mock_ready.is_set.return_value = True
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.get_json()["status"] == "not ready"
+
+
+def test_ready_endpoint_without_warm_up(client):
+    """Test readiness falls back to the database health check without warm-up."""
+    with patch("app.db.health_check", return_value=True):
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.get_json()["status"] == "ready"
+
+
 def test_get_name_existing(client):
     """Test getting rank for an existing name."""
     mock_result = {"name": "Noah", "rank": 1, "count": 4382, "year": 2024}
@@ -54,6 +106,40 @@ def test_get_name_existing(client):
         assert data["count"] == 4382
 
 
+def test_get_name_includes_distribution(client):
+    """Test name lookup includes share and percentile."""
+    mock_result = {"name": "Noah", "rank": 1, "count": 400, "year": 2024}
+    distribution = RankDistribution([(1, 400), (2, 300), (3, 200), (4, 100)])
+
+    with (
+        patch("app.db.get_name_rank", return_value=mock_result),
+        patch("app.db.get_rank_distribution", return_value=distribution),
+    ):
+        response = client.get("/api/v1/names/Noah")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["share"] == 40.0
+        assert data["percentile"] == 75.0
+        assert data["cumulative_share"] == 40.0
+
+
+@pytest.mark.parametrize("error", [DeadlineExceeded("Query cancelled"), Overloaded("Too many requests", retry_after=1)])
+def test_get_name_without_distribution(client, error):
+    """Test a found name is still returned when the distribution cannot be loaded in time."""
+    mock_result = {"name": "Noah", "rank": 1, "count": 400, "year": 2024}
+
+    with (
+        patch("app.db.get_name_rank", return_value=mock_result),
+        patch("app.db.get_rank_distribution", side_effect=error),
+    ):
+        response = client.get("/api/v1/names/Noah")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["rank"] == 1
+        assert data["share"] is None
+        assert data["percentile"] is None
+
+
 def test_get_name_not_found(client):
     """Test getting rank for a name that doesn't exist."""
     with patch("app.db.get_name_rank", return_value=None):
@@ -95,6 +181,226 @@ def test_get_all_names_with_limit(client):
         mock_get.assert_called_once_with(limit=50)
 
 
+def test_get_stats(client):
+    """Test rank distribution statistics."""
+    distribution = RankDistribution([(1, 400), (2, 300), (3, 200), (4, 100)])
+
+    with patch("app.db.get_rank_distribution", return_value=distribution):
+        response = client.get("/api/v1/stats?top=2")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["total_births"] == 1000
+        assert data["top"]["share"] == 70.0
+
+
+def test_get_stats_unavailable(client):
+    """Test statistics endpoint when no data can be loaded."""
+    with patch("app.db.get_rank_distribution", return_value=None):
+        response = client.get("/api/v1/stats")
+        assert response.status_code == 503
+
+
+def test_request_id_propagated(client):
+    """Test incoming request ID is echoed on the response."""
+    with patch("app.db.health_check", return_value=True):
+        response = client.get("/health", headers={"X-Request-ID": "trace-123"})
+        assert response.headers["X-Request-ID"] == "trace-123"
+
+
+def test_request_id_generated(client):
+    """Test a request ID is generated when the caller sends none."""
+    with patch("app.db.health_check", return_value=True):
+        response = client.get("/health")
+        assert len(response.headers["X-Request-ID"]) == 32
+
+
+def test_expired_deadline_rejected(client):
+    """Test requests whose deadline has already passed are rejected without a query."""
+    with patch("app.db.get_name_rank") as mock_get:
+        response = client.get("/api/v1/names/Noah", headers={"X-Request-Timeout-Ms": "0"})
+        assert response.status_code == 504
+        mock_get.assert_not_called()
+
+
+@pytest.mark.parametrize("header", ["nan", "inf", "-inf", "soon"])
+def test_invalid_deadline_ignored(client, header):
+    """Test a malformed or non-finite deadline header is treated as no deadline."""
+    mock_result = {"name": "Noah", "rank": 1, "count": 4382, "year": 2024}
+
+    with patch("app.db.get_name_rank", return_value=mock_result), patch("app.set_deadline") as mock_set:
+        response = client.get("/api/v1/names/Noah", headers={"X-Request-Timeout-Ms": header})
+        assert response.status_code == 200
+        mock_set.assert_called_once_with(None)
+
+
+def test_deadline_exceeded_during_query(client):
+    """Test running out of time in the database layer returns 504."""
+    with patch("app.db.get_name_rank", side_effect=DeadlineExceeded("Query cancelled")):
+        response = client.get("/api/v1/names/Noah", headers={"X-Request-Timeout-Ms": "100"})
+        assert response.status_code == 504
+
+
+def test_overloaded_returns_503_with_retry_after(client):
+    """Test shed requests get 503 and a Retry-After header."""
+    with patch("app.db.get_name_rank", side_effect=Overloaded("Too many requests", retry_after=2)):
+        response = client.get("/api/v1/names/Noah")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "2"
+
+
+@pytest.mark.parametrize(
+    "error, status",
+    [(DeadlineExceeded("Query cancelled"), 504), (Overloaded("Too many requests", retry_after=2), 503)],
+)
+def test_internal_transport_errors_use_msgpack(client, error, status):
+    """Test errors on the internal transport are MessagePack, like its other responses."""
+    with patch("app.db.get_name_rank", side_effect=error):
+        response = client.get("/internal/v1/names/Noah")
+
+    assert response.status_code == status
+    assert response.mimetype == "application/msgpack"
+    assert "error" in msgpack.unpackb(response.data)
+
+
+def test_internal_transport_expired_deadline_uses_msgpack(client):
+    """Test an already expired deadline on the internal transport is rejected in MessagePack."""
+    response = client.get("/internal/v1/names/Noah", headers={"X-Request-Timeout-Ms": "0"})
+
+    assert response.status_code == 504
+    assert msgpack.unpackb(response.data)["error"] == "Request deadline exceeded"
+
+
+def test_rate_limit_per_client(client):
+    """Test clients over their token bucket get 429 while others are unaffected."""
+    with (
+        patch("app.rate_limiter", TokenBucketLimiter(rate=0.001, burst=1)),
+        patch("app.TRUSTED_PROXIES", 1),
+        patch("app.db.get_all_names", return_value=[]),
+    ):
+        assert client.get("/api/v1/names", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 200
+
+        response = client.get("/api/v1/names", headers={"X-Forwarded-For": "10.0.0.1"})
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+
+        assert client.get("/api/v1/names", headers={"X-Forwarded-For": "10.0.0.2"}).status_code == 200
+
+
+def test_rate_limit_ignores_spoofed_forwarded_hops(client):
+    """Test a client cannot reset its bucket by prepending its own X-Forwarded-For hops."""
+    with (
+        patch("app.rate_limiter", TokenBucketLimiter(rate=0.001, burst=1)),
+        patch("app.TRUSTED_PROXIES", 2),
+        patch("app.db.get_all_names", return_value=[]),
+    ):
+        # A GCE load balancer appends "<client>, <load balancer>" to whatever the client sent
+        forwarded = "1.1.1.1, 10.0.0.1, 130.211.0.1"
+        assert client.get("/api/v1/names", headers={"X-Forwarded-For": forwarded}).status_code == 200
+
+        response = client.get("/api/v1/names", headers={"X-Forwarded-For": "2.2.2.2, 10.0.0.1, 130.211.0.1"})
+        assert response.status_code == 429
+
+        assert client.get("/api/v1/names", headers={"X-Forwarded-For": "10.0.0.2, 130.211.0.1"}).status_code == 200
+
+
+def test_rate_limit_ignores_forwarded_for_by_default(client):
+    """Test X-Forwarded-For is ignored unless trusted proxies are configured, so it cannot be forged."""
+    with (
+        patch("app.rate_limiter", TokenBucketLimiter(rate=0.001, burst=1)),
+        patch("app.db.get_all_names", return_value=[]),
+    ):
+        assert client.get("/api/v1/names", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 200
+        assert client.get("/api/v1/names", headers={"X-Forwarded-For": "10.0.0.2"}).status_code == 429
+
+
+@pytest.mark.parametrize(
+    "trusted_proxies, forwarded, expected",
+    [
+        (1, "10.0.0.1", "10.0.0.1"),
+        (1, "1.1.1.1, 10.0.0.1", "10.0.0.1"),
+        (2, "1.1.1.1, 10.0.0.1, 172.16.0.5", "10.0.0.1"),
+        (2, "10.0.0.1", "127.0.0.1"),
+        (0, "10.0.0.1", "127.0.0.1"),
+    ],
+)
+def test_client_id_trusted_proxies(trusted_proxies, forwarded, expected):
+    """Test the client is taken from the hop added by the outermost trusted proxy."""
+    with (
+        patch("app.TRUSTED_PROXIES", trusted_proxies),
+        app.test_request_context(headers={"X-Forwarded-For": forwarded}, environ_base={"REMOTE_ADDR": "127.0.0.1"}),
+    ):
+        assert client_id() == expected
+
+
+def test_rate_limit_applies_to_internal_transport(client):
+    """Test the MessagePack endpoints share the per-client token bucket."""
+    with (
+        patch("app.rate_limiter", TokenBucketLimiter(rate=0.001, burst=1)),
+        patch("app.TRUSTED_PROXIES", 1),
+        patch("app.db.get_name_rank", return_value=None),
+    ):
+        assert client.get("/internal/v1/names/Noah", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 404
+
+        response = client.get("/internal/v1/names/Noah", headers={"X-Forwarded-For": "10.0.0.1"})
+        assert response.status_code == 429
+        assert response.mimetype == "application/msgpack"
+        assert msgpack.unpackb(response.data)["error"] == "Rate limit exceeded"
+        assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_rpc_get_name(client):
+    """Test single-name lookup over the internal MessagePack transport."""
+    mock_result = {"name": "Noah", "rank": 1, "count": 4382, "year": 2024}
+
+    with (
+        patch("app.db.get_name_rank", return_value=mock_result),
+        patch("app.db.get_rank_distribution", return_value=None),
+    ):
+        response = client.get("/internal/v1/names/Noah")
+        assert response.status_code == 200
+        assert response.mimetype == "application/msgpack"
+        data = msgpack.unpackb(response.data, raw=False)
+        assert data["name"] == "Noah"
+        assert data["rank"] == 1
+
+
+def test_rpc_get_name_not_found(client):
+    """Test internal lookup of a missing name."""
+    with patch("app.db.get_name_rank", return_value=None):
+        response = client.get("/internal/v1/names/Unknown")
+        assert response.status_code == 404
+        assert "error" in msgpack.unpackb(response.data, raw=False)
+
+
+def test_rpc_batch_lookup(client):
+    """Test batch lookup returns results in request order with None for missing names."""
+    found = {"noah": {"name": "Noah", "rank": 1, "count": 4382, "year": 2024}}
+
+    with (
+        patch("app.db.get_name_ranks", return_value=found) as mock_get,
+        patch("app.db.get_rank_distribution", return_value=None),
+    ):
+        response = client.post(
+            "/internal/v1/names/lookup",
+            data=msgpack.packb({"names": ["Unknown", "NOAH"]}),
+            content_type="application/msgpack",
+        )
+        assert response.status_code == 200
+        results = msgpack.unpackb(response.data, raw=False)["results"]
+        assert results[0] is None
+        assert results[1]["name"] == "Noah"
+        mock_get.assert_called_once_with(["Unknown", "NOAH"])
+
+
+def test_rpc_batch_lookup_invalid_body(client):
+    """Test batch lookup rejects malformed bodies."""
+    response = client.post("/internal/v1/names/lookup", data=b"not msgpack", content_type="application/msgpack")
+    assert response.status_code == 400
+
+    response = client.post("/internal/v1/names/lookup", data=msgpack.packb({"names": "Noah"}))
+    assert response.status_code == 400
+
+
 def test_404_handler(client):
     """Test 404 error handler."""
     response = client.get("/nonexistent")
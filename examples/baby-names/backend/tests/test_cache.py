@@ -0,0 +1,232 @@
+"""
+Unit tests for the shared cache tier.
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import psycopg2
+import pytest
+import redis
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from admission import ConcurrencyLimiter
+from cache import SharedCache
+
+NOAH = {"name": "Noah", "rank": 1, "count": 4382, "year": 2024}
+OLIVER = {"name": "Oliver", "rank": 3, "count": 4000, "year": 2024}
+
+
+@pytest.fixture
+def shared_cache():
+    """Create a shared cache on an in-memory Redis stand-in."""
+    return SharedCache(fakeredis.FakeRedis(), ttl=60, retry_seconds=5)
+
+
+@pytest.fixture
+def cache_server():
+    """Run a Redis-compatible stand-in server on a local TCP port."""
+    server = fakeredis.TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def mock_db(shared_cache):
+    """Create a database instance with the shared cache enabled and a fixed dataset version."""
+    with patch("database.psycopg2.pool.ThreadedConnectionPool"):
+        from database import Database
+
+        db = Database()
+        db.cache = shared_cache
+        db._dataset_version = "v1"
+        db._dataset_version_checked_at = time.monotonic()
+        yield db
+
+
+def mock_cursor(db, **results):
+    """Make pooled connections return a cursor with the given fetch results."""
+    cursor = MagicMock(**{f"{method}.return_value": value for method, value in results.items()})
+    db.connection_pool.getconn.return_value.cursor.return_value = cursor
+    return cursor
+
+
+def test_get_many_round_trip(shared_cache):
+    """Test stored records and cached misses come back, and uncached names are absent."""
+    shared_cache.set_many("v1", {"noah": NOAH, "zzz": None})
+
+    found = shared_cache.get_many("v1", ["noah", "zzz", "oliver"])
+
+    assert found == {"noah": NOAH, "zzz": None}
+    assert shared_cache.snapshot()["hit_ratio"] == pytest.approx(2 / 3, abs=1e-4)
+
+
+def test_keys_versioned(shared_cache):
+    """Test a new dataset version does not see entries cached for the old one."""
+    shared_cache.set_many("v1", {"noah": NOAH})
+
+    assert shared_cache.get_many("v2", ["noah"]) == {}
+
+
+def test_set_many_pipelined_with_ttl(shared_cache):
+    """Test records are written with the configured TTL."""
+    shared_cache.set_many("v1", {"noah": NOAH, "oliver": OLIVER})
+
+    ttl = shared_cache.client.ttl(SharedCache.key("v1", "oliver"))
+    assert 0 < ttl <= 60
+
+
+def test_failure_bypasses_cache(shared_cache):
+    """Test a failed call disables the cache for retry_seconds instead of retrying on every lookup."""
+    shared_cache.client = MagicMock()
+    shared_cache.client.mget.side_effect = redis.ConnectionError("refused")
+
+    assert shared_cache.get_many("v1", ["noah"]) == {}
+    assert shared_cache.get_many("v1", ["noah"]) == {}
+
+    shared_cache.client.mget.assert_called_once()
+    snapshot = shared_cache.snapshot()
+    assert snapshot["errors"] == 1
+    assert snapshot["bypassed"] == 1
+    assert snapshot["available"] is False
+
+
+def test_unreachable_server_bypassed_quickly():
+    """Test an unreachable cache server costs no more than the connect timeout."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    shared_cache = SharedCache.from_url(f"redis://127.0.0.1:{port}/0", timeout_ms=50)
+
+    start = time.perf_counter()
+    assert shared_cache.get_many("v1", ["noah"]) == {}
+    shared_cache.set_many("v1", {"noah": NOAH})
+
+    assert time.perf_counter() - start < 0.5
+    assert shared_cache.snapshot()["errors"] == 1
+
+
+def test_shared_between_clients(cache_server):
+    """Test two replicas share entries through a Redis-compatible server."""
+    replica_a = SharedCache.from_url(cache_server, timeout_ms=1000)
+    replica_b = SharedCache.from_url(cache_server, timeout_ms=1000)
+
+    replica_a.set_many("v1", {"noah": NOAH})
+
+    assert replica_b.get_many("v1", ["noah", "oliver"]) == {"noah": NOAH}
+
+
+def test_name_rank_served_from_cache(mock_db):
+    """Test a cached lookup does not take a database connection or an admission slot."""
+    mock_cursor(mock_db, fetchone=NOAH)
+
+    assert mock_db.get_name_rank("Noah") == NOAH
+    mock_db.connection_pool.getconn.reset_mock()
+
+    with patch.object(mock_db.limiter, "acquire") as mock_acquire:
+        assert mock_db.get_name_rank("NOAH") == NOAH
+
+    mock_acquire.assert_not_called()
+    mock_db.connection_pool.getconn.assert_not_called()
+    tiers = mock_db.cache_stats()
+    assert tiers["shared"]["hits"] == 1
+    assert tiers["database"]["lookups"] == 1
+
+
+def test_name_rank_not_found_cached(mock_db):
+    """Test names missing from the dataset are cached too."""
+    mock_cursor(mock_db, fetchone=None)
+
+    assert mock_db.get_name_rank("Zzz") is None
+    assert mock_db.get_name_rank("Zzz") is None
+
+    assert mock_db.connection_pool.getconn.call_count == 1
+
+
+def test_name_rank_error_not_cached(mock_db):
+    """Test a failed query is not cached as "not found"."""
+    mock_db.connection_pool.getconn.return_value.cursor.side_effect = psycopg2.OperationalError("connection lost")
+
+    assert mock_db.get_name_rank("Noah") is None
+
+    assert mock_db.cache.get_many("v1", ["noah"]) == {}
+
+
+def test_name_ranks_queries_only_misses(mock_db):
+    """Test a batch lookup queries the database only for names not in the shared cache."""
+    mock_db.cache.set_many("v1", {"noah": NOAH, "zzz": None})
+    cursor = mock_cursor(mock_db, fetchall=[OLIVER])
+
+    found = mock_db.get_name_ranks(["Noah", "Oliver", "Zzz", "Missing"])
+
+    assert found == {"noah": NOAH, "oliver": OLIVER}
+    assert cursor.execute.call_args.args[1] == (["oliver", "missing"],)
+    assert mock_db.cache.get_many("v1", ["oliver", "missing"]) == {"oliver": OLIVER, "missing": None}
+
+
+def test_name_ranks_all_cached(mock_db):
+    """Test a fully cached batch takes no database connection."""
+    mock_db.cache.set_many("v1", {"noah": NOAH, "oliver": OLIVER})
+
+    assert mock_db.get_name_ranks(["Noah", "oliver"]) == {"noah": NOAH, "oliver": OLIVER}
+    mock_db.connection_pool.getconn.assert_not_called()
+
+
+def test_dataset_version_change_invalidates(mock_db):
+    """Test a reload (new table OID) moves lookups to new keys and drops the rank distribution."""
+    mock_db._dataset_version_checked_at = 0.0
+    mock_db._distribution = MagicMock()
+    mock_cursor(mock_db, fetchone=(16400,))
+
+    assert mock_db.dataset_version() == "16400"
+    assert mock_db._distribution is None
+
+
+def test_dataset_version_kept_on_error(mock_db):
+    """Test the last known version is used when it cannot be rechecked."""
+    mock_db._dataset_version_checked_at = 0.0
+    mock_db.connection_pool.getconn.side_effect = psycopg2.OperationalError("connection lost")
+
+    assert mock_db.dataset_version() == "v1"
+
+
+def test_dataset_version_backs_off_when_pool_saturated(mock_db):
+    """Test cache hits stay fast while the limiter is full and the version cannot be rechecked."""
+    mock_db.cache.set_many("v1", {"noah": NOAH})
+    mock_db._dataset_version_checked_at = 0.0
+    mock_db.limiter = ConcurrencyLimiter(1, 20)
+    mock_db.limiter.acquire(0)
+
+    timings = []
+
+    def lookup():
+        start = time.perf_counter()
+        assert mock_db.get_name_rank("Noah") == NOAH
+        timings.append(time.perf_counter() - start)
+
+    with patch("database.POOL_TIMEOUT_SECONDS", 0.2):
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(timings) == 8
+    assert max(timings) < 0.4
+    assert sorted(timings)[-2] < 0.1
+    assert mock_db.limiter.snapshot()["rejected"] == 1
+    mock_db.connection_pool.getconn.assert_not_called()
+
+    # The failed read counts as a check: later hits do not retry it until the TTL expires
+    assert mock_db.get_name_rank("Noah") == NOAH
+    assert mock_db.limiter.snapshot()["rejected"] == 1
@@ -4,18 +4,25 @@ Unit tests for database layer.
 
 import os
 import sys
+import threading
 from unittest.mock import MagicMock, patch
 
+import psycopg2
 import pytest
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from admission import ConcurrencyLimiter, Overloaded
+from deadlines import DeadlineExceeded, set_deadline
+
+import database
+
 
 @pytest.fixture
 def mock_db():
     """Create mock database instance."""
-    with patch("database.psycopg2.pool.SimpleConnectionPool"):
+    with patch("database.psycopg2.pool.ThreadedConnectionPool"):
         from database import Database
 
         db = Database()
@@ -107,3 +114,265 @@ def test_connection_pool_management(mock_db):
 
     mock_db.return_connection(conn)
     mock_db.connection_pool.putconn.assert_called_once_with(conn)
+
+
+def test_pool_exhausted_sheds_request(mock_db):
+    """Test an exhausted pool sheds the lookup instead of reporting the name as not found."""
+    mock_db.connection_pool.getconn.side_effect = psycopg2.pool.PoolError("connection pool exhausted")
+
+    with pytest.raises(Overloaded):
+        mock_db.get_name_rank("Noah")
+
+    assert mock_db.limiter.snapshot()["in_flight"] == 0
+
+
+def test_get_rank_distribution_cached(mock_db):
+    """Test rank distribution is loaded once and served from memory."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [(1, 400), (2, 300)]
+
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    mock_db.connection_pool.getconn.return_value = mock_conn
+
+    with patch.object(mock_db, "dataset_version", return_value="16400"):
+        first = mock_db.get_rank_distribution()
+        second = mock_db.get_rank_distribution()
+
+        assert first is second
+        assert first.total_births == 700
+        mock_cursor.execute.assert_called_once()
+
+        mock_db.refresh_rank_distribution()
+        mock_db.get_rank_distribution()
+        assert mock_cursor.execute.call_count == 2
+
+
+def test_get_rank_distribution_rebuilt_after_reload(mock_db):
+    """Test a new dataset version rebuilds the distribution even without the shared cache."""
+    assert mock_db.cache is None
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = (16400,)
+    mock_cursor.fetchall.return_value = [(1, 400), (2, 300)]
+    mock_db.connection_pool.getconn.return_value.cursor.return_value = mock_cursor
+
+    assert mock_db.get_rank_distribution().total_births == 700
+
+    # reload_data.py swaps in a new table; the next version check sees its OID
+    mock_cursor.fetchone.return_value = (16500,)
+    mock_cursor.fetchall.return_value = [(1, 800), (2, 600)]
+    assert mock_db.get_rank_distribution().total_births == 700
+
+    mock_db._dataset_version_checked_at = 0.0
+    assert mock_db.get_rank_distribution().total_births == 1400
+
+
+def test_get_rank_distribution_failure(mock_db):
+    """Test rank distribution is unavailable when the query fails, and the reload backs off."""
+    mock_db.connection_pool.getconn.side_effect = Exception("Connection failed")
+
+    with patch.object(mock_db, "dataset_version", return_value=None):
+        assert mock_db.get_rank_distribution() is None
+        assert mock_db.get_rank_distribution() is None
+
+    mock_db.connection_pool.getconn.assert_called_once()
+
+
+def test_get_rank_distribution_not_blocked_while_loading(mock_db):
+    """Test callers do not wait on another thread's load, and a load that fails is not retried at once."""
+    loading = threading.Event()
+    release = threading.Event()
+
+    def slow_fetch():
+        loading.set()
+        release.wait(5)
+        raise Overloaded("Too many requests", retry_after=1)
+
+    def load():
+        try:
+            mock_db.get_rank_distribution()
+        except Overloaded as error:
+            errors.append(error)
+
+    errors = []
+    results = []
+    with (
+        patch.object(mock_db, "dataset_version", return_value="16400"),
+        patch.object(mock_db, "_fetch_rank_counts", side_effect=slow_fetch) as mock_fetch,
+    ):
+        loader = threading.Thread(target=load)
+        loader.start()
+        assert loading.wait(5)
+
+        results.append(mock_db.get_rank_distribution())
+        release.set()
+        loader.join()
+
+        results.append(mock_db.get_rank_distribution())
+
+    assert len(errors) == 1
+    assert results == [None, None]
+    mock_fetch.assert_called_once()
+
+
+def test_query_bounded_by_deadline(mock_db):
+    """Test a request deadline sets a local statement timeout before the query."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = None
+
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    mock_db.connection_pool.getconn.return_value = mock_conn
+
+    set_deadline(1000)
+    try:
+        mock_db.get_name_rank("Noah")
+    finally:
+        set_deadline(None)
+
+    statement, params = mock_cursor.execute.call_args_list[0].args
+    assert statement == "SET LOCAL statement_timeout = %s"
+    assert 0 < params[0] <= 1000
+
+
+def test_query_rejected_after_deadline(mock_db):
+    """Test no query is issued once the deadline has passed."""
+    mock_cursor = MagicMock()
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    mock_db.connection_pool.getconn.return_value = mock_conn
+
+    set_deadline(-1)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            mock_db.get_name_rank("Noah")
+    finally:
+        set_deadline(None)
+
+    mock_cursor.execute.assert_not_called()
+    mock_db.connection_pool.getconn.assert_not_called()
+
+
+def test_statement_timeout_raises_deadline_exceeded(mock_db):
+    """Test a cancelled statement is reported as a deadline failure."""
+    mock_cursor = MagicMock()
+    mock_cursor.execute.side_effect = psycopg2.errors.QueryCanceled("canceling statement due to statement timeout")
+
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    mock_db.connection_pool.getconn.return_value = mock_conn
+
+    with pytest.raises(DeadlineExceeded):
+        mock_db.get_all_names()
+
+
+def test_pool_wait_sheds_load(mock_db):
+    """Test waiting for a connection gives up with Overloaded when all slots stay busy."""
+    mock_db.connection_pool.getconn.return_value = MagicMock()
+
+    with patch("database.POOL_TIMEOUT_SECONDS", 0.01):
+        held = [mock_db.get_connection() for _ in range(database.CONCURRENCY_LIMIT)]
+        with pytest.raises(Overloaded):
+            mock_db.get_connection()
+
+        mock_db.return_connection(held[0])
+        assert mock_db.get_connection() is not None
+
+
+def test_pool_wait_capped_by_deadline(mock_db):
+    """Test a short request deadline bounds the wait for a connection."""
+    mock_db.connection_pool.getconn.return_value = MagicMock()
+
+    for _ in range(database.CONCURRENCY_LIMIT):
+        mock_db.get_connection()
+
+    set_deadline(10)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            mock_db.get_connection()
+    finally:
+        set_deadline(None)
+
+
+def test_health_check_bypasses_admission(mock_db):
+    """Test health checks still run while every admission slot is taken."""
+    mock_db.connection_pool.getconn.return_value = MagicMock()
+
+    for _ in range(database.CONCURRENCY_LIMIT):
+        mock_db.get_connection()
+
+    assert mock_db.health_check() is True
+
+
+def test_overloaded_propagates(mock_db):
+    """Test load shedding is not reported as a missing name."""
+    with patch.object(mock_db.limiter, "acquire", side_effect=Overloaded("full", 1)):
+        with pytest.raises(Overloaded):
+            mock_db.get_name_rank("Noah")
+
+
+def test_pool_created_lazily():
+    """Test constructing the database does not open a connection pool."""
+    with patch("database.psycopg2.pool.ThreadedConnectionPool") as mock_pool_class:
+        lazy_db = database.Database()
+        mock_pool_class.assert_not_called()
+
+        lazy_db.get_connection()
+        mock_pool_class.assert_called_once()
+
+
+def test_warm_up_success(mock_db):
+    """Test warm-up primes connections and the rank distribution before reporting ready."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [(1, 400)]
+
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    mock_db.connection_pool.getconn.return_value = mock_conn
+
+    assert mock_db.warm_up() is True
+    assert mock_db.ready.is_set()
+    assert mock_db.get_rank_distribution().total_births == 400
+
+
+def test_warm_up_min_connections_above_concurrency_limit(mock_db):
+    """Test warm-up succeeds when more idle connections are configured than the limiter admits."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [(1, 400)]
+    mock_db.connection_pool.getconn.return_value.cursor.return_value = mock_cursor
+    mock_db.limiter = ConcurrencyLimiter(2, 20)
+
+    with patch("database.MIN_CONNECTIONS", 5):
+        assert mock_db.warm_up() is True
+
+    assert mock_db.ready.is_set()
+    assert mock_db.limiter.snapshot()["in_flight"] == 0
+
+
+def test_warm_up_failure(mock_db):
+    """Test warm-up leaves the database not ready when Postgres is unavailable."""
+    mock_db.connection_pool.getconn.side_effect = Exception("Connection failed")
+
+    assert mock_db.warm_up() is False
+    assert not mock_db.ready.is_set()
+
+
+def test_get_name_ranks(mock_db):
+    """Test batch lookup issues one query and keys results by lower-cased name."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [{"name": "Noah", "rank": 1, "count": 4382, "year": 2024}]
+
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    mock_db.connection_pool.getconn.return_value = mock_conn
+
+    results = mock_db.get_name_ranks(["NOAH", "Unknown"])
+
+    assert results == {"noah": {"name": "Noah", "rank": 1, "count": 4382, "year": 2024}}
+    assert mock_cursor.execute.call_args.args[1] == (["noah", "unknown"],)
@@ -0,0 +1,103 @@
+"""
+Unit tests for structured logging and request tracing.
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import observability
+from observability import JsonFormatter, finish_request, start_request, timed_phase
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def shared_source(path: str) -> str:
+    """Read an observability module without the parts that differ per service (docstring and logger name)."""
+    with open(path) as f:
+        source = f.read()
+    source = source.split('"""', 2)[2]
+    return re.sub(r'logging\.getLogger\("baby_names\.\w+"\)', "logging.getLogger(...)", source)
+
+
+def test_frontend_copy_in_sync():
+    """Test the frontend's copy of this module differs only in its docstring and logger name."""
+    backend = shared_source(os.path.join(SERVICE_DIR, "observability.py"))
+    frontend = shared_source(os.path.join(SERVICE_DIR, "..", "frontend", "observability.py"))
+
+    assert frontend == backend
+
+
+def test_json_formatter_includes_extra_fields():
+    """Test log records are rendered as JSON with extra fields."""
+    record = logging.makeLogRecord({"name": "test", "levelname": "ERROR", "msg": "boom", "request_id": "abc", "error": "x"})
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "boom"
+    assert entry["request_id"] == "abc"
+    assert entry["error"] == "x"
+
+
+def test_start_request_generates_id():
+    """Test a request ID is generated when none is supplied."""
+    assert start_request("given-id") == "given-id"
+    assert len(start_request()) == 32
+
+
+def test_request_id_cleared_after_request():
+    """Test a finished request's ID is not reused for later log lines on the same thread."""
+    start_request("abc")
+    finish_request("GET", "/", 200, duration_ms=1.0)
+
+    assert observability.current_request_id() is None
+
+
+def test_phase_timings_accumulate():
+    """Test repeated phases are summed into the request breakdown."""
+    start_request()
+    with timed_phase("query"):
+        pass
+    with timed_phase("query"):
+        pass
+
+    timings = finish_request("GET", "/", 200, duration_ms=1.0)
+
+    assert set(timings) == {"query"}
+
+
+def test_slow_request_logged_with_phases():
+    """Test slow requests are logged with their phase breakdown."""
+    start_request("slow-id")
+    with timed_phase("pool_wait"):
+        pass
+
+    with (
+        patch.object(observability, "SLOW_REQUEST_MS", 10),
+        patch.object(observability, "SLOW_REQUEST_SAMPLE_RATE", 1.0),
+        patch.object(observability.logger, "warning") as mock_warning,
+    ):
+        finish_request("GET", "/api/v1/names/Noah", 200, duration_ms=50.0)
+
+    mock_warning.assert_called_once()
+    assert "pool_wait" in mock_warning.call_args.kwargs["extra"]["phases"]
+
+
+def test_slow_request_not_sampled():
+    """Test slow requests outside the sample are not logged as slow."""
+    start_request()
+
+    with (
+        patch.object(observability, "SLOW_REQUEST_MS", 10),
+        patch.object(observability, "SLOW_REQUEST_SAMPLE_RATE", 0.0),
+        patch.object(observability.logger, "warning") as mock_warning,
+    ):
+        finish_request("GET", "/", 200, duration_ms=50.0)
+
+    mock_warning.assert_not_called()
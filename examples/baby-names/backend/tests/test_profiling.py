@@ -0,0 +1,156 @@
+"""
+Unit tests for on-demand profiling and slow-request sampling.
+"""
+
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import observability
+import profiling
+from app import app
+from profiling import collapsed_stacks, sample_stacks
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def debug_token():
+    """Enable the debug endpoints with a known token."""
+    with patch.object(profiling, "DEBUG_TOKEN", "secret"):
+        yield {profiling.DEBUG_TOKEN_HEADER: "secret"}
+
+
+def test_frontend_copy_identical():
+    """Test the frontend ships the same profiling module as the backend."""
+    service_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with (
+        open(os.path.join(service_dir, "profiling.py")) as backend,
+        open(os.path.join(service_dir, "..", "frontend", "profiling.py")) as frontend,
+    ):
+        assert frontend.read() == backend.read()
+
+
+def test_debug_endpoints_hidden_without_token(client):
+    """Test debug endpoints do not exist unless DEBUG_TOKEN is set."""
+    with patch.object(profiling, "DEBUG_TOKEN", ""):
+        assert client.get("/debug/slow-requests").status_code == 404
+        assert client.get("/debug/profile?seconds=0.1").status_code == 404
+
+
+def test_debug_endpoints_require_token(client, debug_token):
+    """Test debug endpoints reject a missing or wrong token."""
+    assert client.get("/debug/slow-requests").status_code == 403
+    assert client.get("/debug/slow-requests", headers={profiling.DEBUG_TOKEN_HEADER: "wrong"}).status_code == 403
+
+
+def test_sample_stacks_sees_other_threads():
+    """Test the sampler records collapsed stacks of other threads, rooted at the thread name."""
+    stop = threading.Event()
+    worker = threading.Thread(target=stop.wait, name="sampled-worker")
+    worker.start()
+    try:
+        stacks = sample_stacks(0.05, interval=0.01)
+    finally:
+        stop.set()
+        worker.join()
+
+    worker_stacks = [stack for stack in stacks if stack.startswith("sampled-worker;")]
+    assert worker_stacks
+    assert all("sample_stacks" not in stack for stack in stacks)
+    assert collapsed_stacks(stacks).splitlines()[0].rsplit(" ", 1)[1].isdigit()
+
+
+def test_profile_endpoint_returns_collapsed_stacks(client, debug_token):
+    """Test the profile endpoint returns text in collapsed stack format."""
+    with patch.object(profiling, "sample_stacks", return_value={"main;handler (app.py:1)": 3}) as mock_sample:
+        response = client.get("/debug/profile?seconds=120", headers=debug_token)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert response.get_data(as_text=True) == "main;handler (app.py:1) 3\n"
+    mock_sample.assert_called_once_with(profiling.PROFILE_MAX_SECONDS)
+
+
+def test_profile_endpoint_rejects_bad_duration(client, debug_token):
+    """Test a non-numeric duration is rejected."""
+    response = client.get("/debug/profile?seconds=abc", headers=debug_token)
+    assert response.status_code == 400
+
+
+def test_profile_endpoint_one_at_a_time(client, debug_token):
+    """Test a second concurrent profile is refused."""
+    with profiling._sampling_lock:
+        response = client.get("/debug/profile?seconds=0.1", headers=debug_token)
+    assert response.status_code == 409
+
+
+def test_slow_requests_recorded_with_phases(client, debug_token):
+    """Test slow requests are kept in the buffer, newest first, with their phases."""
+    observability.start_request("slow-1")
+    with observability.timed_phase("query"):
+        pass
+    with patch.object(observability, "SLOW_REQUEST_MS", 10):
+        observability.finish_request("GET", "/api/v1/names/Noah", 200, duration_ms=50.0)
+        observability.start_request("fast-1")
+        observability.finish_request("GET", "/api/v1/names/Noah", 200, duration_ms=1.0)
+
+    response = client.get("/debug/slow-requests", headers=debug_token)
+
+    assert response.status_code == 200
+    newest = response.get_json()["requests"][0]
+    assert newest["request_id"] == "slow-1"
+    assert newest["duration_ms"] == 50.0
+    assert "query" in newest["phases"]
+
+
+def test_slow_request_buffer_bounded():
+    """Test only the most recent slow requests are kept."""
+    with patch.object(observability, "SLOW_REQUEST_MS", 10):
+        for i in range(observability.SLOW_REQUEST_BUFFER_SIZE + 5):
+            observability.start_request(f"slow-{i}")
+            observability.finish_request("GET", "/", 200, duration_ms=50.0)
+
+    slow_requests = observability.recent_slow_requests()
+    assert len(slow_requests) == observability.SLOW_REQUEST_BUFFER_SIZE
+    assert slow_requests[0]["request_id"] == f"slow-{observability.SLOW_REQUEST_BUFFER_SIZE + 4}"
+
+
+def test_sampled_slow_request_keeps_profile(client, debug_token):
+    """Test a sampled request that turns out slow is recorded with a pstats report."""
+    with (
+        patch.object(profiling, "PROFILE_SAMPLE_RATE", 1.0),
+        patch.object(observability, "SLOW_REQUEST_MS", 0),
+        patch("app.db.health_check", return_value=True),
+    ):
+        response = client.get("/health", headers={observability.REQUEST_ID_HEADER: "profiled-1"})
+
+    assert response.status_code == 200
+    entry = next(e for e in observability.recent_slow_requests() if e["request_id"] == "profiled-1")
+    assert "function calls" in entry["profile"]
+    assert not profiling._request_profile_lock.locked()
+
+
+def test_unsampled_request_not_profiled(client):
+    """Test requests outside the sample carry no profile."""
+    with (
+        patch.object(profiling, "PROFILE_SAMPLE_RATE", 0.0),
+        patch.object(observability, "SLOW_REQUEST_MS", 0),
+        patch("app.db.health_check", return_value=True),
+    ):
+        client.get("/health", headers={observability.REQUEST_ID_HEADER: "unprofiled-1"})
+
+    entry = next(e for e in observability.recent_slow_requests() if e["request_id"] == "unprofiled-1")
+    assert "profile" not in entry
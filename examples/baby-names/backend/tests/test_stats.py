@@ -0,0 +1,77 @@
+"""
+Unit tests for rank distribution statistics.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats import RankDistribution
+
+
+@pytest.fixture
+def distribution():
+    """Create a small distribution of 4 names totalling 1000 births."""
+    return RankDistribution([(3, 200), (1, 400), (4, 100), (2, 300)])
+
+
+def test_totals(distribution):
+    """Test totals are computed from all rows."""
+    assert distribution.total_names == 4
+    assert distribution.total_births == 1000
+    assert distribution.cumulative == [400, 700, 900, 1000]
+
+
+def test_cumulative_count(distribution):
+    """Test cumulative counts by rank threshold."""
+    assert distribution.cumulative_count(0) == 0
+    assert distribution.cumulative_count(2) == 700
+    assert distribution.cumulative_count(10) == 1000
+
+
+def test_top_share(distribution):
+    """Test share of births covered by top N ranks."""
+    assert distribution.top_share(1) == 40.0
+    assert distribution.top_share(3) == 90.0
+
+
+def test_names_for_share(distribution):
+    """Test number of names needed to cover a share of births."""
+    assert distribution.names_for_share(40) == 1
+    assert distribution.names_for_share(50) == 2
+    assert distribution.names_for_share(100) == 4
+
+
+def test_describe_name(distribution):
+    """Test per-name share and percentile."""
+    figures = distribution.describe_name(rank=2, count=300)
+    assert figures["share"] == 30.0
+    assert figures["percentile"] == 50.0
+    assert figures["cumulative_share"] == 70.0
+
+
+def test_tied_ranks():
+    """Test tied ranks are counted together."""
+    tied = RankDistribution([(1, 500), (2, 250), (2, 250)])
+    assert tied.cumulative_count(2) == 1000
+    assert tied.describe_name(rank=2, count=250)["percentile"] == 0.0
+
+
+def test_empty_distribution():
+    """Test an empty distribution reports no figures."""
+    empty = RankDistribution([])
+    assert empty.total_births == 0
+    assert empty.top_share(10) == 0.0
+    assert empty.describe_name(rank=1, count=1)["share"] is None
+
+
+def test_summary(distribution):
+    """Test summary includes coverage thresholds and top-N share."""
+    summary = distribution.summary(top=2)
+    assert summary["total_names"] == 4
+    assert summary["names_for_share"]["50"] == 2
+    assert summary["top"] == {"n": 2, "count": 700, "share": 70.0}
@@ -0,0 +1,123 @@
+"""
+Startup-time benchmark for the baby-names services.
+
+For each service this measures:
+- import time: how long `import app` takes in a fresh interpreter
+- time to first response: from process start until the health endpoint answers (any status)
+- time to ready: from process start until the readiness endpoint returns 200
+
+Usage:
+    python benchmarks/startup.py [--runs 5] [--timeout 30] [--service backend]
+
+The backend only becomes ready when PostgreSQL is reachable using the DB_* environment
+variables; without it, import time and time to first response are still reported.
+Set DB_WARM_UP=true to include pool and cache warm-up in the backend's time to ready.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVICES = {
+    "backend": {
+        "dir": os.path.join(ROOT, "backend"),
+        "url": os.getenv("BACKEND_URL", "http://localhost:5000"),
+        "health": "/health",
+        "ready": "/ready",
+    },
+    "frontend": {
+        "dir": os.path.join(ROOT, "frontend"),
+        "url": os.getenv("FRONTEND_URL", "http://localhost:8080"),
+        "health": "/health",
+        "ready": "/health",
+    },
+}
+
+POLL_INTERVAL = 0.01  # seconds
+
+
+def measure_import(service_dir):
+    """Time `import app` in a fresh interpreter, in seconds."""
+    code = "import time; start = time.perf_counter(); import app; print(time.perf_counter() - start)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=service_dir, capture_output=True, text=True, check=True, env=os.environ.copy()
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def measure_startup(service, timeout):
+    """
+    Start the service and time its first response and readiness.
+
+    Returns:
+        Tuple of (seconds to first response, seconds to ready or None if it never became ready)
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "app.py"], cwd=service["dir"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    first_response = None
+    ready = None
+
+    try:
+        while time.perf_counter() - start < timeout and ready is None:
+            try:
+                if first_response is None:
+                    requests.get(service["url"] + service["health"], timeout=1)
+                    first_response = time.perf_counter() - start
+                response = requests.get(service["url"] + service["ready"], timeout=1)
+                if response.status_code == 200:
+                    ready = time.perf_counter() - start
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(POLL_INTERVAL)
+    finally:
+        process.terminate()
+        process.wait()
+
+    return first_response, ready
+
+
+def summarize(label, samples):
+    """Format min/median/max of a list of samples in milliseconds."""
+    samples = [sample for sample in samples if sample is not None]
+    if not samples:
+        return f"  {label:<22} n/a"
+    return (
+        f"  {label:<22} median {statistics.median(samples) * 1000:8.1f} ms"
+        f"  min {min(samples) * 1000:8.1f} ms  max {max(samples) * 1000:8.1f} ms  (n={len(samples)})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs per service")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for each service to become ready")
+    parser.add_argument("--service", choices=sorted(SERVICES), action="append", help="Service to measure (default: all)")
+    args = parser.parse_args()
+
+    for name in args.service or sorted(SERVICES):
+        service = SERVICES[name]
+        imports, first_responses, readies = [], [], []
+
+        for _ in range(args.runs):
+            imports.append(measure_import(service["dir"]))
+            first_response, ready = measure_startup(service, args.timeout)
+            first_responses.append(first_response)
+            readies.append(ready)
+
+        print(name)
+        print(summarize("import", imports))
+        print(summarize("time to first response", first_responses))
+        print(summarize("time to ready", readies))
+
+
+if __name__ == "__main__":
+    main()
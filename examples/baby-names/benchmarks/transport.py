@@ -0,0 +1,111 @@
+"""
+Benchmark of the frontend-to-backend transports.
+
+Compares the public JSON REST path with the internal MessagePack path:
+- codec: encode + decode cost and payload size for a single name record and a 100-name batch
+- live (--live): request latency against a running backend for each codec, both over a new connection
+  per request and over a keep-alive session, so the codec and connection reuse effects are separated
+
+Usage:
+    python benchmarks/transport.py [--iterations 20000]
+    python benchmarks/transport.py --live [--requests 500] [--name Noah]
+
+Environment variables:
+    BACKEND_URL: Backend service URL for --live (default: http://localhost:5000)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+import msgpack
+import requests
+
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:5000")
+
+RECORD = {
+    "name": "Noah",
+    "rank": 1,
+    "count": 4382,
+    "year": 2024,
+    "share": 1.4286,
+    "percentile": 99.99,
+    "cumulative_share": 1.43,
+}
+BATCH = {"results": [dict(RECORD, name=f"Name{i}", rank=i + 1) for i in range(100)]}
+
+
+def time_codec(encode, decode, payload, iterations):
+    """Time encode + decode of a payload, returning (microseconds per round trip, encoded size)."""
+    encoded = encode(payload)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode(encode(payload))
+    return (time.perf_counter() - start) / iterations * 1e6, len(encoded)
+
+
+def run_codec(iterations):
+    """Print codec costs for both transports."""
+    codecs = {
+        "json": (lambda obj: json.dumps(obj).encode(), json.loads),
+        "msgpack": (msgpack.packb, lambda data: msgpack.unpackb(data, raw=False)),
+    }
+    for label, payload in (("single record", RECORD), ("100-name batch", BATCH)):
+        print(label)
+        for codec, (encode, decode) in codecs.items():
+            per_call, size = time_codec(encode, decode, payload, iterations)
+            print(f"  {codec:<8} {per_call:8.2f} us/round trip  {size:6d} bytes")
+
+
+def time_requests(fetch, count):
+    """Time `count` calls of fetch(), returning latencies in milliseconds."""
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fetch()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def run_live(count, name):
+    """Print request latency for every codec and connection combination against a running backend."""
+    codecs = {
+        "json": (f"{BACKEND_URL}/api/v1/names/{name}", lambda response: response.json()),
+        "msgpack": (f"{BACKEND_URL}/internal/v1/names/{name}", lambda response: msgpack.unpackb(response.content, raw=False)),
+    }
+    connections = {"new connection": lambda: requests, "keep-alive": requests.Session}
+
+    for connection, make_client in connections.items():
+        client = make_client()
+        for codec, (url, decode) in codecs.items():
+
+            def fetch(client=client, url=url, decode=decode):
+                decode(client.get(url, timeout=5))
+
+            fetch()  # warm up
+            latencies = sorted(time_requests(fetch, count))
+            p99 = latencies[int(len(latencies) * 0.99) - 1]
+            print(
+                f"  {codec:<8} {connection:<15} median {statistics.median(latencies):7.2f} ms"
+                f"  p99 {p99:7.2f} ms  (n={count})"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000, help="Codec round trips per measurement")
+    parser.add_argument("--live", action="store_true", help="Also measure requests against a running backend")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per transport in --live mode")
+    parser.add_argument("--name", default="Noah", help="Name to look up in --live mode")
+    args = parser.parse_args()
+
+    run_codec(args.iterations)
+    if args.live:
+        print(f"live ({BACKEND_URL})")
+        run_live(args.requests, args.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+--liquibase formatted sql
+
+--changeset baby-names:3 runInTransaction:false
+--comment: Index LOWER(name) so case-insensitive lookups use an index scan; built concurrently so readers are not blocked
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_name_lower ON baby_names (LOWER(name));
+
+--rollback DROP INDEX CONCURRENTLY IF EXISTS idx_name_lower;
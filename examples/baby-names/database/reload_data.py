@@ -0,0 +1,187 @@
+"""
+Zero-downtime reload of the baby_names table.
+
+Builds a shadow copy of baby_names, bulk loads it from a CSV file with COPY, recreates the live
+table's indexes on it with CREATE INDEX CONCURRENTLY, analyzes it and then swaps it in with
+renames in one short transaction. Readers keep using the old table until the swap commits and
+then see the new data in full; they never see a partially loaded table.
+
+Usage:
+    python database/reload_data.py database/data/baby-names-boys-2024.csv
+
+The CSV must have a header row followed by rank,name,count,year columns.
+
+Environment variables:
+    DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD: Connection settings (backend defaults)
+"""
+
+import argparse
+import os
+import re
+import time
+
+import psycopg2
+
+TABLE = "baby_names"
+SHADOW = "baby_names_shadow"
+SHADOW_SUFFIX = "_shadow"
+
+# While the swap waits for its lock, new readers queue behind it, so it gives up quickly (well within a
+# reader's latency budget) and retries after a backoff, letting long-running readers finish in between
+LOCK_TIMEOUT_MS = 100
+SWAP_ATTEMPTS = 40
+SWAP_MAX_BACKOFF_SECONDS = 1.0
+
+INDEX_DEF = re.compile(r"^CREATE (UNIQUE )?INDEX (\S+) ON (\S+) ")
+CONSTRAINT_TYPES = {"p": "PRIMARY KEY", "u": "UNIQUE"}
+
+
+def connect():
+    """Open an autocommit connection using the backend's DB_* settings."""
+    conn = psycopg2.connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        port=os.getenv("DB_PORT", "5432"),
+        dbname=os.getenv("DB_NAME", "baby_names"),
+        user=os.getenv("DB_USER", "app_user"),
+        password=os.getenv("DB_PASSWORD", "app_password"),
+    )
+    conn.autocommit = True
+    return conn
+
+
+def live_indexes(cursor):
+    """
+    List the live table's indexes.
+
+    Returns:
+        List of (index name, index definition, constraint type or None) tuples
+    """
+    cursor.execute(
+        """
+        SELECT i.relname, pg_get_indexdef(i.oid), c.contype
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        LEFT JOIN pg_constraint c ON c.conindid = x.indexrelid AND c.conrelid = x.indrelid
+        WHERE x.indrelid = %s::regclass
+        ORDER BY i.relname
+        """,
+        (TABLE,),
+    )
+    return cursor.fetchall()
+
+
+def build_shadow(cursor, csv_path, indexes):
+    """
+    Create and load the shadow table, then index and analyze it.
+
+    Args:
+        cursor: Autocommit cursor
+        csv_path: CSV file with rank,name,count,year columns
+        indexes: Live table indexes from live_indexes()
+
+    Returns:
+        Number of rows loaded
+    """
+    cursor.execute(f"DROP TABLE IF EXISTS {SHADOW}")
+    cursor.execute(f"CREATE TABLE {SHADOW} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+
+    # Load before indexing: one bulk index build is much cheaper than maintaining indexes per row
+    with open(csv_path) as data:
+        cursor.copy_expert(f"COPY {SHADOW} (rank, name, count, year) FROM STDIN WITH (FORMAT csv, HEADER true)", data)
+
+    for name, definition, constraint_type in indexes:
+        unique = INDEX_DEF.match(definition).group(1) or ""
+        cursor.execute(INDEX_DEF.sub(f"CREATE {unique}INDEX CONCURRENTLY {name}{SHADOW_SUFFIX} ON {SHADOW} ", definition))
+        if constraint_type in CONSTRAINT_TYPES:
+            cursor.execute(
+                f"ALTER TABLE {SHADOW} ADD CONSTRAINT {name}{SHADOW_SUFFIX} "
+                f"{CONSTRAINT_TYPES[constraint_type]} USING INDEX {name}{SHADOW_SUFFIX}"
+            )
+
+    cursor.execute(f"ANALYZE {SHADOW}")
+    cursor.execute(f"SELECT count(*) FROM {SHADOW}")
+    return cursor.fetchone()[0]
+
+
+def swap(cursor, indexes):
+    """
+    Replace the live table with the shadow table in one short transaction.
+
+    The sequence behind the id column is handed over to the new table so it survives the drop.
+    If readers hold the table for longer than LOCK_TIMEOUT_MS the swap backs off and retries,
+    so new readers are never queued behind it for more than LOCK_TIMEOUT_MS.
+
+    Raises:
+        psycopg2.errors.LockNotAvailable: If the lock could not be taken in SWAP_ATTEMPTS attempts
+    """
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", (TABLE,))
+    sequence = cursor.fetchone()[0]
+
+    for attempt in range(1, SWAP_ATTEMPTS + 1):
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT_MS}ms'")
+            cursor.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+            if sequence:
+                cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+            cursor.execute(f"DROP TABLE {TABLE}")
+            cursor.execute(f"ALTER TABLE {SHADOW} RENAME TO {TABLE}")
+            for name, _, _ in indexes:
+                cursor.execute(f"ALTER INDEX {name}{SHADOW_SUFFIX} RENAME TO {name}")
+            if sequence:
+                cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id")
+            cursor.execute("COMMIT")
+            return
+        except psycopg2.errors.LockNotAvailable:
+            cursor.execute("ROLLBACK")
+            if attempt == SWAP_ATTEMPTS:
+                raise
+            time.sleep(min(0.05 * 2**attempt, SWAP_MAX_BACKOFF_SECONDS))
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+
+def reload(conn, csv_path):
+    """
+    Reload baby_names from a CSV file without blocking readers.
+
+    Args:
+        conn: Autocommit connection
+        csv_path: CSV file with rank,name,count,year columns
+
+    Returns:
+        Number of rows in the new table
+
+    Raises:
+        ValueError: If the CSV file contains no rows
+    """
+    cursor = conn.cursor()
+    indexes = live_indexes(cursor)
+
+    rows = build_shadow(cursor, csv_path, indexes)
+    if rows == 0:
+        cursor.execute(f"DROP TABLE {SHADOW}")
+        raise ValueError(f"{csv_path} contains no rows; keeping the current data")
+
+    swap(cursor, indexes)
+    cursor.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv_path", help="CSV file with rank,name,count,year columns")
+    args = parser.parse_args()
+
+    conn = connect()
+    try:
+        rows = reload(conn, args.csv_path)
+    finally:
+        conn.close()
+
+    print(f"Reloaded {TABLE} with {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
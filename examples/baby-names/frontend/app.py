@@ -3,16 +3,126 @@ Frontend web UI for baby names lookup.
 Serves HTML interface that calls the backend API.
 """
 
+import gzip
+import json
 import os
+import time
 
+import msgpack
+import observability
+import profiling
 import requests
-from flask import Flask, render_template, request
+from flask import Flask, Response, g, render_template, request, url_for
+from observability import propagation_headers, timed_phase
 
 app = Flask(__name__)
+observability.init_app(app)
+profiling.init_app(app)
 
 # Backend API URL from environment variable
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:5000")
 
+# Time budget for a page view; the remainder is passed to the backend so it can stop when we give up
+REQUEST_BUDGET_SECONDS = float(os.getenv("BACKEND_TIMEOUT_SECONDS", "5"))
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+
+# X-Forwarded-For entries appended by the proxies in front of the frontend (2 behind a GCE load balancer);
+# 0 means clients connect directly and the frontend adds their address itself
+TRUSTED_PROXIES = int(os.getenv("TRUSTED_PROXIES", "0"))
+
+# Backend transport: "json" uses the public REST API, "msgpack" the internal binary endpoints
+BACKEND_TRANSPORT = os.getenv("BACKEND_TRANSPORT", "json").lower()
+# Keep-alive session for the internal transport
+backend_session = requests.Session()
+
+# Prebuilt client-side name index (see build_name_index.py)
+NAME_INDEX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "name_index")
+
+
+def load_name_index():
+    """
+    Load the prebuilt, gzip-compressed name index named by its manifest.
+
+    Returns:
+        Tuple of (version, compressed bytes), or (None, None) if no index has been built
+    """
+    try:
+        with open(os.path.join(NAME_INDEX_DIR, "manifest.json")) as f:
+            version = json.load(f)["version"]
+        with open(os.path.join(NAME_INDEX_DIR, f"names-{version}.json.gz"), "rb") as f:
+            return version, f.read()
+    except (OSError, ValueError, KeyError):
+        return None, None
+
+
+NAME_INDEX_VERSION, NAME_INDEX_BODY = load_name_index()
+
+
+@app.before_request
+def start_deadline():
+    """Start the time budget for this request."""
+    g.deadline = time.monotonic() + REQUEST_BUDGET_SECONDS
+
+
+def backend_headers(remaining: float) -> dict:
+    """
+    Build headers for a backend call.
+
+    Args:
+        remaining: Seconds left in the request budget
+
+    Returns:
+        Dictionary with trace, deadline and client headers
+    """
+    headers = {**propagation_headers(), DEADLINE_HEADER: str(max(int(remaining * 1000), 0))}
+    forwarded = forwarded_for()
+    if forwarded:
+        headers["X-Forwarded-For"] = forwarded
+    return headers
+
+
+def forwarded_for():
+    """
+    Build the X-Forwarded-For header that identifies the end user to the backend.
+
+    Behind TRUSTED_PROXIES proxies the header is passed on as they wrote it, so the client sits at the
+    same position as on requests the load balancer sends straight to the backend. Without proxies the
+    frontend is the first hop and appends the peer address; hops the client sent itself come before it
+    and are ignored by the backend.
+
+    Returns:
+        Header value, or None if the request did not come through the expected proxies
+    """
+    forwarded = request.headers.get("X-Forwarded-For", "")
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    if TRUSTED_PROXIES > 0:
+        return ", ".join(hops) if len(hops) >= TRUSTED_PROXIES else None
+    if request.remote_addr:
+        return ", ".join([*hops, request.remote_addr])
+    return None
+
+
+def fetch_name(name: str, headers: dict, timeout: float):
+    """
+    Look up a name on the backend using the configured transport.
+
+    Args:
+        name: Baby name to look up
+        headers: Headers to send with the request
+        timeout: Request timeout in seconds
+
+    Returns:
+        Tuple of (status code, decoded name record or None)
+    """
+    if BACKEND_TRANSPORT == "msgpack":
+        response = backend_session.get(f"{BACKEND_URL}/internal/v1/names/{name}", headers=headers, timeout=timeout)
+        payload = msgpack.unpackb(response.content, raw=False) if response.status_code == 200 else None
+    else:
+        response = requests.get(f"{BACKEND_URL}/api/v1/names/{name}", headers=headers, timeout=timeout)
+        payload = response.json() if response.status_code == 200 else None
+
+    return response.status_code, payload
+
 
 @app.route("/", methods=["GET"])
 def index():
@@ -29,19 +139,57 @@ def index():
     if name:
         # Call backend API
         try:
-            response = requests.get(f"{BACKEND_URL}/api/v1/names/{name}", timeout=5)
+            remaining = g.deadline - time.monotonic()
+            with timed_phase("backend"):
+                status, payload = fetch_name(name, backend_headers(remaining), max(remaining, 0.001))
 
-            if response.status_code == 200:
-                result = response.json()
-            elif response.status_code == 404:
+            if status == 200:
+                result = payload
+            elif status == 404:
                 error = f'Name "{name}" not found in the 2024 rankings'
+            elif status == 504:
+                error = "Search timed out, please try again"
+            elif status in (429, 503):
+                error = "The service is busy, please try again shortly"
             else:
                 error = "Error searching for name"
 
         except requests.exceptions.RequestException as e:
+            observability.logger.error("Backend request failed", extra={"error": str(e)})
             error = f"Unable to connect to backend service: {e}"
+        except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError, ValueError) as e:
+            # A truncated or corrupt body decodes to one of these; JSON decode errors are ValueErrors
+            observability.logger.error("Malformed backend response", extra={"error": str(e)})
+            error = "Error searching for name"
+
+    name_index_url = url_for("name_index", version=NAME_INDEX_VERSION) if NAME_INDEX_VERSION else None
+
+    with timed_phase("render"):
+        page = render_template("index.html", name=name, result=result, error=error, name_index_url=name_index_url)
+    return page
+
+
+@app.route("/name-index/<version>.json", methods=["GET"])
+def name_index(version):
+    """
+    Serve the client-side name index.
+
+    The URL is versioned by content, so responses can be cached forever.
+
+    Args:
+        version: Index version from the manifest
+    """
+    if NAME_INDEX_VERSION is None or version != NAME_INDEX_VERSION:
+        return {"error": "Name index not found"}, 404
+
+    headers = {"Cache-Control": "public, max-age=31536000, immutable", "Vary": "Accept-Encoding"}
+    if request.accept_encodings.quality("gzip") > 0:
+        headers["Content-Encoding"] = "gzip"
+        body = NAME_INDEX_BODY
+    else:
+        body = gzip.decompress(NAME_INDEX_BODY)
 
-    return render_template("index.html", name=name, result=result, error=error)
+    return Response(body, mimetype="application/json", headers=headers)
 
 
 @app.route("/health", methods=["GET"])
@@ -0,0 +1,95 @@
+"""
+Build the client-side name index served by the frontend.
+
+Reads the baby names CSV and writes a gzip-compressed, content-versioned JSON index to
+name_index/, plus a manifest naming the current version. The frontend serves the index
+with far-future cache headers and the search page uses it to answer lookups and typeahead
+in the browser.
+
+Usage:
+    python build_name_index.py [--csv ../database/data/baby-names-boys-2024.csv]
+"""
+
+import argparse
+import csv
+import glob
+import gzip
+import hashlib
+import json
+import os
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CSV = os.path.join(HERE, "..", "database", "data", "baby-names-boys-2024.csv")
+INDEX_DIR = os.path.join(HERE, "name_index")
+MANIFEST = "manifest.json"
+
+
+def build_index(rows):
+    """
+    Build the index document from CSV rows.
+
+    Names are stored lower-cased and sorted so the browser can binary search them for
+    exact lookups and prefix (typeahead) matches; the other columns are parallel arrays.
+    by_rank lists positions in rank order, so typeahead can take the most popular prefix
+    matches without sorting them on every keystroke.
+
+    Args:
+        rows: Iterable of dicts with rank, name, count and year keys
+
+    Returns:
+        Index document as a dictionary
+    """
+    records = sorted(rows, key=lambda row: row["name"].lower())
+    ranks = [int(row["rank"]) for row in records]
+    return {
+        "keys": [row["name"].lower() for row in records],
+        "names": [row["name"] for row in records],
+        "ranks": ranks,
+        "counts": [int(row["count"]) for row in records],
+        "years": [int(row["year"]) for row in records],
+        "by_rank": sorted(range(len(records)), key=lambda i: (ranks[i], i)),
+    }
+
+
+def write_index(index, index_dir=INDEX_DIR):
+    """
+    Write the compressed index under a content-derived version and point the manifest at it.
+
+    Args:
+        index: Index document from build_index()
+        index_dir: Output directory
+
+    Returns:
+        Version string of the written index
+    """
+    body = json.dumps(index, separators=(",", ":"), sort_keys=True).encode()
+    version = hashlib.sha256(body).hexdigest()[:16]
+
+    os.makedirs(index_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(index_dir, "names-*.json.gz")):
+        os.remove(stale)
+
+    # mtime=0 keeps the compressed bytes reproducible for identical data
+    with open(os.path.join(index_dir, f"names-{version}.json.gz"), "wb") as f:
+        f.write(gzip.compress(body, compresslevel=9, mtime=0))
+
+    with open(os.path.join(index_dir, MANIFEST), "w") as f:
+        json.dump({"version": version, "entries": len(index["keys"])}, f)
+
+    return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=DEFAULT_CSV, help="CSV file with rank,name,count,year columns")
+    args = parser.parse_args()
+
+    with open(args.csv, newline="") as f:
+        index = build_index(csv.DictReader(f))
+
+    version = write_index(index)
+    print(f"Wrote name index {version} ({len(index['keys'])} names) to {INDEX_DIR}")
+
+
+if __name__ == "__main__":
+    main()
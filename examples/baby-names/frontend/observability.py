@@ -0,0 +1,247 @@
+"""
+Structured logging and request tracing for the frontend web UI.
+Generates the request ID for each page view and forwards it to the backend so
+log lines from both tiers can be correlated. Log records are emitted as JSON
+lines by a background queue listener.
+
+This module is a copy of backend/observability.py that differs only in this
+docstring and the logger name; backend/tests/test_observability.py checks that
+the rest stays in sync.
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from flask import g, request
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Requests slower than this are candidates for slow-request logging
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+# Fraction of slow requests that are actually logged
+SLOW_REQUEST_SAMPLE_RATE = float(os.getenv("SLOW_REQUEST_SAMPLE_RATE", "1.0"))
+# Number of recent slow requests kept in memory for the debug endpoint
+SLOW_REQUEST_BUFFER_SIZE = int(os.getenv("SLOW_REQUEST_BUFFER_SIZE", "100"))
+
+logger = logging.getLogger("baby_names.frontend")
+
+_request_id = contextvars.ContextVar("request_id", default=None)
+_phase_timings = contextvars.ContextVar("phase_timings", default=None)
+_request_profile = contextvars.ContextVar("request_profile", default=None)
+_slow_requests = deque(maxlen=SLOW_REQUEST_BUFFER_SIZE)
+_slow_requests_lock = threading.Lock()
+_listener = None
+
+# Attributes present on every LogRecord; anything else was passed via `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName", "request_id"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record, "%Y-%m-%dT%H:%M:%S%z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the current request ID before they leave the calling thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        return True
+
+
+def configure_logging(level: Optional[str] = None):
+    """
+    Route the service logger through a non-blocking queue to a JSON stdout handler.
+
+    Args:
+        level: Log level name (defaults to the LOG_LEVEL environment variable, then INFO)
+    """
+    global _listener
+
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    logger.setLevel(level or os.getenv("LOG_LEVEL", "INFO").upper())
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def current_request_id() -> Optional[str]:
+    """Get the request ID of the request being handled, if any."""
+    return _request_id.get()
+
+
+@contextmanager
+def timed_phase(phase: str):
+    """
+    Time a block of work and add it to the current request's phase breakdown.
+
+    Args:
+        phase: Phase name, e.g. "pool_wait", "query" or "render"
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _phase_timings.get()
+        if timings is not None:
+            timings[phase] = timings.get(phase, 0.0) + (time.perf_counter() - start) * 1000
+
+
+def propagation_headers() -> Dict[str, str]:
+    """
+    Get headers that carry the current trace to a downstream service.
+
+    Returns:
+        Dictionary of headers to add to outgoing requests
+    """
+    request_id = _request_id.get()
+    return {REQUEST_ID_HEADER: request_id} if request_id else {}
+
+
+def start_request(request_id: Optional[str] = None) -> str:
+    """
+    Begin tracing a request.
+
+    Args:
+        request_id: Incoming request ID, or None to generate one
+
+    Returns:
+        The request ID in effect
+    """
+    request_id = request_id or uuid.uuid4().hex
+    _request_id.set(request_id)
+    _phase_timings.set({})
+    _request_profile.set(None)
+    return request_id
+
+
+def set_request_profile(profile: str):
+    """
+    Attach a profile of the current request, kept with it if the request is slow.
+
+    Args:
+        profile: Profile report text
+    """
+    _request_profile.set(profile)
+
+
+def finish_request(method: str, path: str, status: int, duration_ms: float) -> Dict[str, float]:
+    """
+    Finish tracing a request, logging it if it was slow and sampled.
+
+    Every slow request is also kept in a bounded in-memory buffer (see recent_slow_requests()).
+
+    Args:
+        method: HTTP method
+        path: Request path
+        status: Response status code
+        duration_ms: Total request duration in milliseconds
+
+    Returns:
+        Phase timings recorded for the request, in milliseconds
+    """
+    timings = {phase: round(ms, 3) for phase, ms in (_phase_timings.get() or {}).items()}
+
+    if duration_ms >= SLOW_REQUEST_MS:
+        entry = {
+            "timestamp": time.time(),
+            "request_id": _request_id.get(),
+            "method": method,
+            "path": path,
+            "status": status,
+            "duration_ms": round(duration_ms, 3),
+            "phases": timings,
+        }
+        profile = _request_profile.get()
+        if profile is not None:
+            entry["profile"] = profile
+        with _slow_requests_lock:
+            _slow_requests.append(entry)
+
+    if duration_ms >= SLOW_REQUEST_MS and random.random() < SLOW_REQUEST_SAMPLE_RATE:
+        logger.warning(
+            "slow request",
+            extra={"method": method, "path": path, "status": status, "duration_ms": round(duration_ms, 3), "phases": timings},
+        )
+    else:
+        logger.debug(
+            "request completed",
+            extra={"method": method, "path": path, "status": status, "duration_ms": round(duration_ms, 3)},
+        )
+
+    # Server threads are reused, so nothing from this request may leak into later log lines
+    _request_id.set(None)
+    _phase_timings.set(None)
+    _request_profile.set(None)
+    return timings
+
+
+def recent_slow_requests() -> List[Dict]:
+    """
+    Get the most recent slow requests, newest first.
+
+    Returns:
+        List of slow request entries with their phase timings (and profile, when one was taken)
+    """
+    with _slow_requests_lock:
+        return list(reversed(_slow_requests))
+
+
+def init_app(app):
+    """
+    Register request tracing hooks on a Flask app.
+
+    Args:
+        app: Flask application
+    """
+    configure_logging()
+
+    @app.before_request
+    def _start_trace():
+        g.request_started = time.perf_counter()
+        g.request_id = start_request(request.headers.get(REQUEST_ID_HEADER))
+
+    @app.after_request
+    def _finish_trace(response):
+        duration_ms = (time.perf_counter() - g.get("request_started", time.perf_counter())) * 1000
+        finish_request(request.method, request.path, response.status_code, duration_ms)
+        response.headers[REQUEST_ID_HEADER] = g.get("request_id", "")
+        return response
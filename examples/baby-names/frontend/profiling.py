@@ -0,0 +1,182 @@
+"""
+On-demand and automatic profiling for the backend and frontend services.
+Debug endpoints, enabled by setting DEBUG_TOKEN, capture a sampling profile of
+all threads as collapsed stacks and list recent slow requests. A small sample
+of requests can also be profiled with cProfile; the profile is kept with the
+request only if it turns out to be slow.
+
+Each service image is built from its own directory, so backend/ and frontend/
+carry identical copies of this module; backend/tests/test_profiling.py checks
+that they stay in sync.
+"""
+
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+import observability
+from flask import Response, abort, g, jsonify, request
+
+DEBUG_TOKEN_HEADER = "X-Debug-Token"
+
+# Debug endpoints are only served when a token is configured
+DEBUG_TOKEN = os.getenv("DEBUG_TOKEN", "")
+# Interval between stack samples for on-demand profiles
+PROFILE_INTERVAL_SECONDS = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+# Fraction of requests profiled with cProfile in automatic mode (0 disables it)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+
+PROFILE_DEFAULT_SECONDS = 10
+PROFILE_MAX_SECONDS = 60
+PROFILE_TOP_FUNCTIONS = 30
+
+# One on-demand profile and one profiled request at a time
+_sampling_lock = threading.Lock()
+_request_profile_lock = threading.Lock()
+
+
+def frame_label(frame) -> str:
+    """Describe a stack frame as "function (file:line)" for collapsed stacks."""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample_stacks(seconds: float, interval: float = PROFILE_INTERVAL_SECONDS) -> Counter:
+    """
+    Sample the stacks of all other threads for a while.
+
+    Args:
+        seconds: How long to sample for
+        interval: Delay between samples
+
+    Returns:
+        Counter of collapsed stacks ("thread;outer;...;inner") to sample counts
+    """
+    own_thread = threading.get_ident()
+    stacks = Counter()
+    deadline = time.monotonic() + seconds
+
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(thread_id, str(thread_id)))
+            stacks[";".join(reversed(labels))] += 1
+        time.sleep(interval)
+
+    return stacks
+
+
+def collapsed_stacks(stacks: Counter) -> str:
+    """Render sampled stacks in collapsed format ("stack count" per line), as read by flamegraph tools."""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+def profile_report(profiler: cProfile.Profile) -> str:
+    """Render a cProfile profile as pstats text, top functions by cumulative time."""
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+    return output.getvalue()
+
+
+def check_debug_token():
+    """Hide debug endpoints unless DEBUG_TOKEN is set, and require it on every call."""
+    if not DEBUG_TOKEN:
+        abort(404)
+    if not hmac.compare_digest(request.headers.get(DEBUG_TOKEN_HEADER, ""), DEBUG_TOKEN):
+        abort(403)
+
+
+def init_app(app):
+    """
+    Register automatic profiling hooks and the debug endpoints on a Flask app.
+
+    Must be called after observability.init_app(), so the profile is attached before the
+    request is finished.
+
+    Args:
+        app: Flask application
+    """
+
+    @app.before_request
+    def _start_profile():
+        if PROFILE_SAMPLE_RATE <= 0 or random.random() >= PROFILE_SAMPLE_RATE:
+            return
+        if not _request_profile_lock.acquire(blocking=False):
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active
+            _request_profile_lock.release()
+            return
+        g.profiler = profiler
+
+    @app.after_request
+    def _finish_profile(response):
+        profiler = g.pop("profiler", None)
+        if profiler is None:
+            return response
+
+        profiler.disable()
+        _request_profile_lock.release()
+
+        duration_ms = (time.perf_counter() - g.request_started) * 1000
+        if duration_ms >= observability.SLOW_REQUEST_MS:
+            observability.set_request_profile(profile_report(profiler))
+        return response
+
+    @app.teardown_request
+    def _discard_profile(error):
+        # Requests that failed without a response never reach _finish_profile
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            _request_profile_lock.release()
+
+    @app.route("/debug/profile", methods=["GET"])
+    def debug_profile():
+        """
+        Sample all threads for a while and return collapsed stacks.
+
+        Query params:
+            seconds: Sampling duration (default 10, max 60)
+        """
+        check_debug_token()
+
+        try:
+            seconds = min(max(float(request.args.get("seconds", PROFILE_DEFAULT_SECONDS)), 0.1), PROFILE_MAX_SECONDS)
+        except ValueError:
+            return jsonify({"error": "seconds must be a number"}), 400
+
+        if not _sampling_lock.acquire(blocking=False):
+            return jsonify({"error": "A profile is already being captured"}), 409
+        try:
+            stacks = sample_stacks(seconds)
+        finally:
+            _sampling_lock.release()
+
+        return Response(collapsed_stacks(stacks), mimetype="text/plain")
+
+    @app.route("/debug/slow-requests", methods=["GET"])
+    def debug_slow_requests():
+        """Return recent slow requests with their phase timings and any profiles."""
+        check_debug_token()
+
+        slow_requests = observability.recent_slow_requests()
+        settings = {"slow_request_ms": observability.SLOW_REQUEST_MS, "profile_sample_rate": PROFILE_SAMPLE_RATE}
+        return jsonify({"count": len(slow_requests), "settings": settings, "requests": slow_requests}), 200
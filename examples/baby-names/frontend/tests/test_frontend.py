@@ -2,17 +2,22 @@
 Unit tests for frontend application.
 """
 
+import gzip
+import json
 import os
 import sys
 from unittest.mock import Mock, patch
 
+import msgpack
 import pytest
 import requests
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app import app
+import observability
+from app import app, forwarded_for
+from build_name_index import build_index, write_index
 
 
 @pytest.fixture
@@ -51,6 +56,120 @@ def test_search_success(client):
         assert b"#1" in response.data
 
 
+def test_search_propagates_request_id(client):
+    """Test the request ID is forwarded to the backend and returned to the caller."""
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"name": "Noah", "rank": 1, "count": 4382, "year": 2024}
+
+    with patch("app.requests.get", return_value=mock_response) as mock_get:
+        response = client.get("/?name=Noah", headers={"X-Request-ID": "trace-123"})
+        assert mock_get.call_args.kwargs["headers"]["X-Request-ID"] == "trace-123"
+        assert response.headers["X-Request-ID"] == "trace-123"
+
+
+def test_request_id_not_propagated_after_request(client):
+    """Test the request ID of a finished page view does not leak into later backend calls."""
+    with patch("app.requests.get", return_value=Mock(status_code=404)):
+        client.get("/?name=Noah", headers={"X-Request-ID": "trace-123"})
+
+    assert observability.propagation_headers() == {}
+
+
+def test_search_generates_request_id(client):
+    """Test a request ID is generated for page views without one."""
+    mock_response = Mock()
+    mock_response.status_code = 404
+
+    with patch("app.requests.get", return_value=mock_response) as mock_get:
+        response = client.get("/?name=Unknown")
+        request_id = response.headers["X-Request-ID"]
+        assert mock_get.call_args.kwargs["headers"]["X-Request-ID"] == request_id
+
+
+def test_search_sends_remaining_deadline(client):
+    """Test the remaining time budget is sent to the backend and used as the timeout."""
+    mock_response = Mock()
+    mock_response.status_code = 404
+
+    with patch("app.requests.get", return_value=mock_response) as mock_get:
+        client.get("/?name=Noah")
+        budget_ms = int(mock_get.call_args.kwargs["headers"]["X-Request-Timeout-Ms"])
+        assert 0 < budget_ms <= 5000
+        assert mock_get.call_args.kwargs["timeout"] <= 5
+
+
+def test_search_backend_timeout(client):
+    """Test search when the backend reports the deadline was exceeded."""
+    mock_response = Mock()
+    mock_response.status_code = 504
+
+    with patch("app.requests.get", return_value=mock_response):
+        response = client.get("/?name=Noah")
+        assert b"timed out" in response.data
+
+
+def test_search_backend_busy(client):
+    """Test search when the backend sheds the request."""
+    mock_response = Mock()
+    mock_response.status_code = 503
+
+    with patch("app.requests.get", return_value=mock_response) as mock_get:
+        response = client.get("/?name=Noah", headers={"X-Forwarded-For": "203.0.113.7"})
+        assert b"busy" in response.data
+        assert mock_get.call_args.kwargs["headers"]["X-Forwarded-For"] == "203.0.113.7, 127.0.0.1"
+
+
+@pytest.mark.parametrize(
+    "trusted_proxies, forwarded, expected",
+    [
+        (0, None, "127.0.0.1"),
+        (0, "203.0.113.7", "203.0.113.7, 127.0.0.1"),
+        (2, "1.1.1.1, 203.0.113.7, 130.211.0.1", "1.1.1.1, 203.0.113.7, 130.211.0.1"),
+        (2, "203.0.113.7", None),
+    ],
+)
+def test_forwarded_for(trusted_proxies, forwarded, expected):
+    """Test the client's address reaches the backend at the position the load balancer puts it."""
+    headers = {"X-Forwarded-For": forwarded} if forwarded else {}
+    with (
+        patch("app.TRUSTED_PROXIES", trusted_proxies),
+        app.test_request_context(headers=headers, environ_base={"REMOTE_ADDR": "127.0.0.1"}),
+    ):
+        assert forwarded_for() == expected
+
+
+def test_search_msgpack_transport(client):
+    """Test name lookup over the internal MessagePack transport."""
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.content = msgpack.packb({"name": "Noah", "rank": 1, "count": 4382, "year": 2024})
+
+    with (
+        patch("app.BACKEND_TRANSPORT", "msgpack"),
+        patch("app.backend_session.get", return_value=mock_response) as mock_get,
+    ):
+        response = client.get("/?name=Noah")
+        assert b"#1" in response.data
+        assert "/internal/v1/names/Noah" in mock_get.call_args.args[0]
+
+
+@pytest.mark.parametrize("content", [b"\xc1", b"\x92\x01", msgpack.packb({"name": "Noah"}) + b"\x00"])
+def test_search_malformed_msgpack_response(client, content):
+    """Test a corrupt MessagePack body shows the normal error message instead of a 500."""
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.content = content
+
+    with (
+        patch("app.BACKEND_TRANSPORT", "msgpack"),
+        patch("app.backend_session.get", return_value=mock_response),
+    ):
+        response = client.get("/?name=Noah")
+        assert response.status_code == 200
+        assert b"Error searching for name" in response.data
+
+
 def test_search_not_found(client):
     """Test search for non-existent name."""
     mock_response = Mock()
@@ -87,3 +206,112 @@ def test_empty_search(client):
     assert response.status_code == 200
     # Should show form but no results or errors
     assert b"Baby Names Rank Finder" in response.data
+
+
+NAME_ROWS = [
+    {"rank": "2", "name": "Oliver", "count": "4000", "year": "2024"},
+    {"rank": "1", "name": "Noah", "count": "4382", "year": "2024"},
+    {"rank": "3", "name": "noel", "count": "900", "year": "2024"},
+]
+
+
+@pytest.fixture
+def name_index():
+    """Serve a small name index built from NAME_ROWS."""
+    body = json.dumps(build_index(NAME_ROWS)).encode()
+    with patch("app.NAME_INDEX_VERSION", "abc123"), patch("app.NAME_INDEX_BODY", gzip.compress(body)):
+        yield body
+
+
+def test_build_index_sorted_columns():
+    """Test the index is sorted by lower-cased name with parallel columns."""
+    index = build_index(NAME_ROWS)
+    assert index["keys"] == ["noah", "noel", "oliver"]
+    assert index["names"] == ["Noah", "noel", "Oliver"]
+    assert index["ranks"] == [1, 3, 2]
+    assert index["counts"] == [4382, 900, 4000]
+    assert index["by_rank"] == [0, 2, 1]
+
+
+def test_write_index_versions_by_content(tmp_path):
+    """Test the written index is named by a content hash and replaces stale versions."""
+    (tmp_path / "names-stale.json.gz").write_bytes(b"old")
+
+    version = write_index(build_index(NAME_ROWS), index_dir=str(tmp_path))
+
+    assert write_index(build_index(NAME_ROWS), index_dir=str(tmp_path)) == version
+    assert json.loads((tmp_path / "manifest.json").read_text()) == {"version": version, "entries": 3}
+    assert sorted(p.name for p in tmp_path.glob("names-*")) == [f"names-{version}.json.gz"]
+    index = json.loads(gzip.decompress((tmp_path / f"names-{version}.json.gz").read_bytes()))
+    assert index["keys"] == ["noah", "noel", "oliver"]
+
+
+def test_name_index_served_compressed(client, name_index):
+    """Test the index is served gzip-encoded with immutable cache headers."""
+    response = client.get("/name-index/abc123.json", headers={"Accept-Encoding": "gzip, br"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "immutable" in response.headers["Cache-Control"]
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(response.data) == name_index
+
+
+def test_name_index_served_uncompressed(client, name_index):
+    """Test the index is decompressed for clients that do not accept gzip."""
+    response = client.get("/name-index/abc123.json")
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    assert response.get_json()["keys"] == ["noah", "noel", "oliver"]
+
+
+def test_name_index_gzip_refused(client, name_index):
+    """Test the index is decompressed for clients that explicitly refuse gzip."""
+    response = client.get("/name-index/abc123.json", headers={"Accept-Encoding": "gzip;q=0, br"})
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    assert response.data == name_index
+
+
+def test_name_index_unknown_version(client, name_index):
+    """Test a stale or unknown index version is not found."""
+    response = client.get("/name-index/old.json")
+    assert response.status_code == 404
+
+
+def test_home_page_links_name_index(client, name_index):
+    """Test the search page loads the current index for client-side lookups."""
+    response = client.get("/")
+    assert b"/name-index/abc123.json" in response.data
+
+
+def test_home_page_without_name_index(client):
+    """Test the search page falls back to server-side lookups when no index was built."""
+    with patch("app.NAME_INDEX_VERSION", None):
+        response = client.get("/")
+    assert response.status_code == 200
+    assert b"/name-index/" not in response.data
+
+
+def test_debug_endpoints_hidden_without_token(client):
+    """Test the profiling endpoints do not exist unless DEBUG_TOKEN is set."""
+    with patch("profiling.DEBUG_TOKEN", ""):
+        assert client.get("/debug/slow-requests").status_code == 404
+
+
+def test_slow_page_views_listed(client):
+    """Test slow page views are listed with their backend and render phases."""
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"name": "Noah", "rank": 1, "count": 4382, "year": 2024}
+
+    with (
+        patch("profiling.DEBUG_TOKEN", "secret"),
+        patch("observability.SLOW_REQUEST_MS", 0),
+        patch("app.requests.get", return_value=mock_response),
+    ):
+        client.get("/?name=Noah", headers={"X-Request-ID": "slow-page"})
+        assert client.get("/debug/slow-requests").status_code == 403
+        response = client.get("/debug/slow-requests", headers={"X-Debug-Token": "secret"})
+
+    entry = next(e for e in response.get_json()["requests"] if e["request_id"] == "slow-page")
+    assert {"backend", "render"} <= set(entry["phases"])
@@ -0,0 +1,64 @@
+"""
+Shared fixtures for performance tests that need a real PostgreSQL.
+
+Each test module names its own scratch schema in a module-level SCHEMA variable; the schema is
+built from the Liquibase changelogs and dropped again when the module finishes.
+"""
+
+import os
+import re
+
+import psycopg2
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CHANGELOG_DIR = os.path.join(ROOT, "database")
+
+
+def changeset_statements():
+    """Yield SQL statements from the Liquibase changelogs, in master changelog order."""
+    with open(os.path.join(CHANGELOG_DIR, "changelog", "db.changelog-master.yaml")) as master:
+        files = re.findall(r"file:\s*(\S+\.sql)", master.read())
+
+    for filename in files:
+        with open(os.path.join(CHANGELOG_DIR, filename)) as changeset:
+            sql = "\n".join(line for line in changeset.read().splitlines() if not line.lstrip().startswith("--"))
+        for statement in sql.split(";"):
+            if statement.strip():
+                yield statement
+
+
+@pytest.fixture(scope="module")
+def db_params():
+    """Connection settings for PostgreSQL, using the backend's DB_* variables."""
+    return {
+        "host": os.getenv("DB_HOST", "localhost"),
+        "port": os.getenv("DB_PORT", "5432"),
+        "dbname": os.getenv("DB_NAME", "baby_names"),
+        "user": os.getenv("DB_USER", "app_user"),
+        "password": os.getenv("DB_PASSWORD", "app_password"),
+    }
+
+
+@pytest.fixture(scope="module")
+def scratch_connection(request, db_params):
+    """Autocommit connection whose search_path is a fresh schema built from the changelogs."""
+    schema = request.module.SCHEMA
+
+    try:
+        conn = psycopg2.connect(connect_timeout=3, options=f"-c search_path={schema}", **db_params)
+    except psycopg2.OperationalError as error:
+        pytest.skip(f"PostgreSQL is not available: {error}")
+
+    conn.autocommit = True
+    cursor = conn.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {schema}")
+
+    for statement in changeset_statements():
+        cursor.execute(statement)
+
+    yield conn
+
+    cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    conn.close()
@@ -0,0 +1,118 @@
+"""
+Query-plan regression tests for every query issued by the backend's Database class.
+
+These tests seed a dedicated schema in PostgreSQL with the Liquibase changesets and a large
+synthetic baby_names dataset, run EXPLAIN (ANALYZE, BUFFERS) for each query and compare the
+plan shape and buffer usage with the baselines recorded in query_plan_baselines.json.
+
+Requirements:
+- PostgreSQL reachable with the DB_* settings below (tests are skipped otherwise)
+- The user must be allowed to create schemas in the database
+
+Usage:
+    pytest tests/performance/ -v
+
+Environment variables:
+    DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD: Connection settings (backend defaults)
+    PLAN_TEST_ROWS: Number of synthetic names to seed (default: 200000)
+    UPDATE_PLAN_BASELINES: Set to 1 to record the current plans as the new baselines
+"""
+
+import json
+import math
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+import database  # noqa: E402
+
+BASELINES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "query_plan_baselines.json")
+SCHEMA = "plan_regression"
+ROWS = int(os.getenv("PLAN_TEST_ROWS", "200000"))
+UPDATE_BASELINES = os.getenv("UPDATE_PLAN_BASELINES") == "1"
+
+# Parameters used to explain each Database query; every *_QUERY constant must appear here
+PLAN_CASES = {
+    "NAME_RANK_QUERY": ("Name4242",),
+    "NAME_RANKS_QUERY": (["name1", "name5000", "name150000", "missing"],),
+    "ALL_NAMES_QUERY": (500,),
+    "RANK_COUNTS_QUERY": None,
+    "HEALTH_CHECK_QUERY": None,
+    "DATASET_VERSION_QUERY": None,
+}
+
+
+@pytest.fixture(scope="module")
+def cursor(scratch_connection):
+    """Seed the scratch schema with synthetic data and yield a cursor on it."""
+    cur = scratch_connection.cursor()
+    cur.execute("TRUNCATE baby_names")
+    cur.execute(
+        """
+        INSERT INTO baby_names (name, rank, count, year)
+        SELECT 'Name' || i, i, %s - i + 1, 2024
+        FROM generate_series(1, %s) AS i
+        """,
+        (ROWS, ROWS),
+    )
+    cur.execute("VACUUM ANALYZE baby_names")
+    yield cur
+    cur.close()
+
+
+@pytest.fixture(scope="module")
+def baselines():
+    """Load recorded baselines, and write back any updates at the end of the module."""
+    with open(BASELINES_FILE) as f:
+        recorded = json.load(f)
+
+    yield recorded
+
+    if UPDATE_BASELINES:
+        with open(BASELINES_FILE, "w") as f:
+            json.dump(recorded, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+def plan_shape(node):
+    """Render a plan tree as node types and index names, ignoring costs and row counts."""
+    label = node["Node Type"]
+    if "Index Name" in node:
+        label += f"[{node['Index Name']}]"
+    children = node.get("Plans", [])
+    if children:
+        label += "(" + ", ".join(plan_shape(child) for child in children) + ")"
+    return label
+
+
+def explain(cursor, query, params):
+    """Run EXPLAIN (ANALYZE, BUFFERS) and return the root plan node."""
+    cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query, params)
+    return cursor.fetchone()[0][0]["Plan"]
+
+
+def test_every_query_has_a_plan_case():
+    """Every query constant in database.py must be covered by the harness."""
+    queries = {name for name in vars(database) if name.endswith("_QUERY")}
+    assert queries == set(PLAN_CASES)
+
+
+@pytest.mark.parametrize("query_name", sorted(PLAN_CASES))
+def test_query_plan(cursor, baselines, query_name):
+    """Plan shape must match the baseline and buffer usage must stay within budget."""
+    plan = explain(cursor, getattr(database, query_name), PLAN_CASES[query_name])
+    shape = plan_shape(plan)
+    buffers = plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+
+    if UPDATE_BASELINES:
+        baselines[query_name] = {"plan": shape, "max_buffers": max(math.ceil(buffers * 1.5), buffers + 8)}
+        return
+
+    assert query_name in baselines, f"No baseline for {query_name}; run with UPDATE_PLAN_BASELINES=1"
+    baseline = baselines[query_name]
+    assert shape == baseline["plan"], f"Plan changed for {query_name}: {shape} (baseline {baseline['plan']})"
+    assert buffers <= baseline["max_buffers"], f"{query_name} touched {buffers} buffers, budget is {baseline['max_buffers']}"
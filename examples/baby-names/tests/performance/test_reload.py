@@ -0,0 +1,181 @@
+"""
+Zero-downtime reload test for database/reload_data.py.
+
+Runs the shadow-table reload while reader threads continuously issue the backend's name lookup and
+a consistency check, and while a long-running reader holds the table across the swap. Readers must
+never fail, never see a mix of old and new data, and their latency during the reload must stay
+within budget: no reader may queue behind the waiting swap for long.
+
+Requirements:
+- PostgreSQL reachable with the backend's DB_* settings (tests are skipped otherwise)
+
+Usage:
+    pytest tests/performance/test_reload.py -v -s
+
+Environment variables:
+    RELOAD_TEST_ROWS: Number of names in the old and new datasets (default: 100000)
+    RELOAD_P99_BUDGET_MS: Maximum reader p99 latency during the reload (default: 500)
+    RELOAD_MAX_BUDGET_MS: Maximum latency of any single read during the reload (default: 1000)
+    RELOAD_LONG_READ_SECONDS: How long the long-running reader holds the table (default: 1.5)
+"""
+
+import csv
+import os
+import random
+import sys
+import threading
+import time
+
+import psycopg2
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+sys.path.insert(0, os.path.join(ROOT, "database"))
+
+import reload_data  # noqa: E402
+
+from database import NAME_RANK_QUERY  # noqa: E402
+
+SCHEMA = "reload_test"
+ROWS = int(os.getenv("RELOAD_TEST_ROWS", "100000"))
+P99_BUDGET_MS = float(os.getenv("RELOAD_P99_BUDGET_MS", "500"))
+MAX_BUDGET_MS = float(os.getenv("RELOAD_MAX_BUDGET_MS", "1000"))
+LONG_READ_SECONDS = float(os.getenv("RELOAD_LONG_READ_SECONDS", "1.5"))
+READERS = 4
+
+
+def p99(latencies):
+    """99th percentile of a list of latencies."""
+    ordered = sorted(latencies)
+    return ordered[max(int(len(ordered) * 0.99) - 1, 0)]
+
+
+class Reader(threading.Thread):
+    """Issues lookups and consistency checks in a loop, recording latencies and anomalies."""
+
+    def __init__(self, db_params):
+        super().__init__(daemon=True)
+        self.conn = psycopg2.connect(options=f"-c search_path={SCHEMA}", **db_params)
+        self.conn.autocommit = True
+        self.stop = threading.Event()
+        self.samples = []  # (timestamp, latency ms)
+        self.errors = []
+        self.mixed_years = []
+
+    def run(self):
+        cursor = self.conn.cursor()
+        while not self.stop.is_set():
+            start = time.perf_counter()
+            try:
+                cursor.execute(NAME_RANK_QUERY, (f"name{random.randint(1, ROWS)}",))
+                cursor.fetchone()
+                cursor.execute("SELECT min(year), max(year), count(*) FROM baby_names")
+                min_year, max_year, count = cursor.fetchone()
+                if min_year != max_year or count != ROWS:
+                    self.mixed_years.append((min_year, max_year, count))
+            except psycopg2.Error as error:
+                self.errors.append(str(error))
+            self.samples.append((time.perf_counter(), (time.perf_counter() - start) * 1000))
+        self.conn.close()
+
+
+class LongReader:
+    """Holds AccessShareLock on baby_names in an open transaction, as a slow report query would."""
+
+    def __init__(self, db_params):
+        self.conn = psycopg2.connect(options=f"-c search_path={SCHEMA}", **db_params)
+        self.released_at = None
+
+    def hold(self, seconds):
+        """Start reading the table and keep the transaction open for a while in the background."""
+        self.conn.cursor().execute("SELECT count(*) FROM baby_names")
+
+        def release():
+            time.sleep(seconds)
+            self.released_at = time.perf_counter()
+            self.conn.commit()
+
+        threading.Thread(target=release, daemon=True).start()
+
+
+def test_reload_does_not_block_readers(scratch_connection, db_params, tmp_path, monkeypatch):
+    """Readers keep flat latency and see only complete datasets, even while a long reader delays the swap."""
+    cursor = scratch_connection.cursor()
+    cursor.execute("TRUNCATE baby_names")
+    cursor.execute(
+        """
+        INSERT INTO baby_names (name, rank, count, year)
+        SELECT 'Name' || i, i, %s - i + 1, 2024
+        FROM generate_series(1, %s) AS i
+        """,
+        (ROWS, ROWS),
+    )
+    cursor.execute("ANALYZE baby_names")
+
+    csv_path = tmp_path / "names-2025.csv"
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["rank", "name", "count", "year"])
+        writer.writerows((i, f"Name{i}", 2 * (ROWS - i + 1), 2025) for i in range(1, ROWS + 1))
+
+    # Hold the table from just before the swap, so the swap has to wait for the long reader
+    long_reader = LongReader(db_params)
+    swap = reload_data.swap
+
+    def swap_behind_long_reader(cursor, indexes):
+        long_reader.hold(LONG_READ_SECONDS)
+        swap(cursor, indexes)
+
+    monkeypatch.setattr(reload_data, "swap", swap_behind_long_reader)
+
+    readers = [Reader(db_params) for _ in range(READERS)]
+    for reader in readers:
+        reader.start()
+
+    time.sleep(1)
+    reload_started = time.perf_counter()
+    reload_data.reload(scratch_connection, str(csv_path))
+    reload_finished = time.perf_counter()
+    time.sleep(0.5)
+    long_reader.conn.close()
+
+    for reader in readers:
+        reader.stop.set()
+    for reader in readers:
+        reader.join()
+
+    samples = [sample for reader in readers for sample in reader.samples]
+    baseline = [ms for at, ms in samples if at < reload_started]
+    during = [ms for at, ms in samples if reload_started <= at <= reload_finished]
+    print(
+        f"\nreload took {(reload_finished - reload_started) * 1000:.0f} ms; "
+        f"reader p99 before {p99(baseline):.1f} ms, during {p99(during):.1f} ms, "
+        f"max {max(during):.1f} ms ({len(during)} samples)"
+    )
+
+    # The swap had to wait for the long reader, and other readers did not queue behind it meanwhile
+    assert long_reader.released_at is not None and long_reader.released_at < reload_finished
+    assert [error for reader in readers for error in reader.errors] == []
+    assert [mixed for reader in readers for mixed in reader.mixed_years] == []
+    assert p99(during) <= P99_BUDGET_MS
+    assert max(during) <= MAX_BUDGET_MS
+
+    cursor.execute("SELECT min(year), max(year), count(*) FROM baby_names")
+    assert cursor.fetchone() == (2025, 2025, ROWS)
+
+
+def test_reload_keeps_indexes_and_sequence(scratch_connection, tmp_path):
+    """The swapped-in table has the live table's indexes and constraints and a working id sequence."""
+    cursor = scratch_connection.cursor()
+    before = sorted(name for name, _, _ in reload_data.live_indexes(cursor))
+
+    csv_path = tmp_path / "names.csv"
+    csv_path.write_text("rank,name,count,year\n1,Noah,4382,2024\n2,Muhammad,4258,2024\n")
+    reload_data.reload(scratch_connection, str(csv_path))
+
+    assert sorted(name for name, _, _ in reload_data.live_indexes(cursor)) == before
+    cursor.execute("SELECT to_regclass('baby_names_shadow')")
+    assert cursor.fetchone()[0] is None
+
+    cursor.execute("INSERT INTO baby_names (name, rank, count) VALUES ('Oliver', 3, 3781) RETURNING id")
+    assert cursor.fetchone()[0] is not None